@@ -3,11 +3,10 @@ import os
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from PyQt5.QtSvg import QSvgWidget
+from PyQt5.QtSvg import QSvgRenderer
 import chess
 import time
-import random
-import requests
+import threading
 from typing import Optional, Tuple, List
 import pygame
 pygame.mixer.init()
@@ -25,133 +24,23 @@ sys.path.append(project_root)
 # Importaciones del motor
 #from motor.search.evaluator.material import MaterialEvaluator
 from chess_bot.motor.search.minimax.simple_chess_engine import MinimaxEngine, MaterialEvaluator
-#from chess_bot.motor.search.zobrist_hash import ZobristHash
+from chess_bot.motor.search.minimax.time_manager import TimeManager
+from chess_bot.motor.search.minimax.opening_book import OpeningBook
 
-class LichessOpenings:
-    """Clase mejorada para manejar la base de datos de aperturas de Lichess"""
-    def __init__(self):
-        self.base_url = "https://explorer.lichess.ovh/masters"
-        self.opening_cache = {}
-        self.last_request_time = 0
-        self.headers = {
-            'User-Agent': 'Chess Engine/1.0'
-        }
-        
-    def get_move(self, board: chess.Board) -> Tuple[Optional[chess.Move], Optional[str]]:
-        """Obtiene un movimiento de la base de datos de aperturas de Lichess"""
-        try:
-            # Revisar cache primero
-            fen = board.fen()
-            if fen in self.opening_cache:
-                print("[INFO] Usando movimiento cacheado")
-                return random.choice(self.opening_cache[fen]), self.opening_cache.get(f"{fen}_opening")
-            
-            # Preparar parámetros de la consulta
-            params = {
-                'fen': fen,
-                'topGames': 0,
-                'recentGames': 0,
-                'moves': 50,
-                'variant': 'standard'
-            }
-            
-            print(f"[INFO] Consultando Lichess API para FEN: {fen}")
-            response = requests.get(
-                self.base_url, 
-                params=params, 
-                headers=self.headers,
-                timeout=5
-            )
-            
-            # Verificar respuesta HTTP
-            if response.status_code != 200:
-                print(f"[WARNING] Error HTTP {response.status_code} al consultar Lichess")
-                return None, None
-                
-            # Parsear respuesta JSON
-            try:
-                data = response.json()
-            except json.JSONDecodeError:
-                print("[ERROR] Error al decodificar respuesta JSON de Lichess")
-                return None, None
-                
-            # Procesar información de apertura
-            opening_info = None
-            if 'opening' in data and data['opening']:
-                opening_info = f"{data['opening'].get('name', 'Unknown')} ({data['opening'].get('eco', '?')})"
-                print(f"[INFO] Apertura encontrada: {opening_info}")
-            
-            # Verificar si hay movimientos disponibles
-            if not data.get('moves'):
-                print("[INFO] No se encontraron movimientos en la base de datos de aperturas")
-                return None, None
-            
-            # Procesar movimientos
-            available_moves = []
-            total_plays = 0
-            
-            # Calcular total de jugadas para ponderación
-            for move_data in data['moves']:
-                total_plays += move_data.get('white', 0) + move_data.get('black', 0)
-            
-            if total_plays == 0:
-                print("[INFO] No hay estadísticas de juego disponibles")
-                return None, None
-            
-            # Procesar cada movimiento
-            for move_data in data['moves']:
-                if 'uci' not in move_data:
-                    continue
-                    
-                try:
-                    move = chess.Move.from_uci(move_data['uci'])
-                    if move not in board.legal_moves:
-                        continue
-                        
-                    # Calcular peso basado en frecuencia
-                    weight = (move_data.get('white', 0) + move_data.get('black', 0)) / total_plays
-                    num_entries = int(weight * 100)
-                    
-                    if num_entries > 0:
-                        available_moves.extend([move] * num_entries)
-                        print(f"[INFO] Movimiento añadido: {move_data.get('san', move_data['uci'])} "
-                              f"(peso: {weight:.2f}, entradas: {num_entries})")
-                        
-                except ValueError as e:
-                    print(f"[WARNING] Error al procesar movimiento {move_data.get('uci')}: {e}")
-                    continue
-            
-            if available_moves:
-                # Guardar en cache
-                self.opening_cache[fen] = available_moves
-                if opening_info:
-                    self.opening_cache[f"{fen}_opening"] = opening_info
-                
-                # Seleccionar movimiento
-                chosen_move = random.choice(available_moves)
-                print(f"[INFO] Movimiento elegido del libro: {board.san(chosen_move)}")
-                return chosen_move, opening_info
-            else:
-                print("[INFO] No se encontraron movimientos válidos en la base de datos")
-                return None, None
-                
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Error en la petición HTTP: {str(e)}")
-            return None, None
-        except Exception as e:
-            print(f"[ERROR] Error inesperado al consultar base de datos: {str(e)}")
-            return None, None
+# Libro Polyglot local (se genera con motor/search/minimax/opening_book.py)
+DEFAULT_BOOK_PATH = os.path.join('gui', 'resources', 'book', 'book.bin')
+#from chess_bot.motor.search.zobrist_hash import ZobristHash
 
 class ChessEngine:
-    """Motor de ajedrez principal que combina minimax con base de datos de aperturas"""
-    def __init__(self, evaluator, depth):
+    """Motor de ajedrez principal que combina minimax con un libro de aperturas local"""
+    def __init__(self, evaluator, depth, book_path=DEFAULT_BOOK_PATH):
         self.minimax_engine = MinimaxEngine(evaluator, depth)
-        self.lichess_db = LichessOpenings()
+        self.opening_book = OpeningBook(book_path)
         
     def search(self, board: chess.Board) -> Tuple[chess.Move, float, Optional[str]]:
         """Busca el mejor movimiento usando libro de aperturas o motor"""
-        # Intentar obtener movimiento del libro
-        book_move, opening_info = self.lichess_db.get_move(board)
+        # Intentar obtener movimiento del libro (sin red: búsqueda binaria en el fichero)
+        book_move, opening_info = self.opening_book.get_move(board)
         
         if book_move is not None:
             print("[INFO] Usando movimiento del libro de aperturas")
@@ -162,22 +51,66 @@ class ChessEngine:
         move, evaluation = self.minimax_engine.search(board)
         return move, evaluation, None
 
-class ChessPiece(QSvgWidget):
-    """Widget para representar una pieza de ajedrez usando SVG"""
+class PiecePixmapCache:
+    """Caché de las piezas para todo el proceso.
+
+    Cada SVG de gui/resources/pieces se lee y se analiza una sola vez con
+    QSvgRenderer; los QPixmap se rasterizan por tamaño, de modo que redibujar
+    el tablero solo copia pixmaps y un cambio de tamaño solo rasteriza las
+    12 piezas una vez más.
+    """
+    PIECE_FILES = {
+        'P': 'wP', 'N': 'wN', 'B': 'wB', 'R': 'wR', 'Q': 'wQ', 'K': 'wK',
+        'p': 'bP', 'n': 'bN', 'b': 'bB', 'r': 'bR', 'q': 'bQ', 'k': 'bK'
+    }
+
+    def __init__(self, pieces_dir=os.path.join('gui', 'resources', 'pieces')):
+        self.pieces_dir = pieces_dir
+        self._renderers = {}
+        self._pixmaps = {}
+
+    def renderer(self, symbol: str) -> QSvgRenderer:
+        renderer = self._renderers.get(symbol)
+        if renderer is None:
+            path = os.path.join(self.pieces_dir, f"{self.PIECE_FILES[symbol]}.svg")
+            renderer = QSvgRenderer(path)
+            self._renderers[symbol] = renderer
+        return renderer
+
+    def pixmap(self, symbol: str, size: int) -> QPixmap:
+        """Pixmap de la pieza con lado `size`, rasterizado solo la primera vez."""
+        key = (symbol, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.renderer(symbol).render(painter)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+# Caché compartida por todas las piezas
+PIECE_PIXMAPS = PiecePixmapCache()
+
+class ChessPiece(QLabel):
+    """Widget para representar una pieza de ajedrez con su pixmap cacheado"""
     def __init__(self, piece, parent=None):
         super().__init__(parent)
         self.piece = piece
+        self.setAlignment(Qt.AlignCenter)
+        self.setFixedSize(50, 50)
         self.load_svg()
         
     def load_svg(self):
-        piece_map = {
-            'P': 'wP', 'N': 'wN', 'B': 'wB', 'R': 'wR', 'Q': 'wQ', 'K': 'wK',
-            'p': 'bP', 'n': 'bN', 'b': 'bB', 'r': 'bR', 'q': 'bQ', 'k': 'bK'
-        }
-        piece_file = f"{piece_map[self.piece]}.svg"
-        path = os.path.join('gui', 'resources', 'pieces', piece_file)
-        self.load(path)
-        self.setFixedSize(50, 50)
+        """Toma de la caché el pixmap de la pieza al tamaño actual"""
+        self.setPixmap(PIECE_PIXMAPS.pixmap(self.piece, min(self.width(), self.height())))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.size() != event.oldSize():
+            self.load_svg()
 
 class ChessSquare(QLabel):
     """Representa una casilla del tablero con soporte para drag & drop"""
@@ -189,6 +122,9 @@ class ChessSquare(QLabel):
         self.setFixedSize(70, 70)
         self.setAlignment(Qt.AlignCenter)
         self.setStyleSheet(f"background-color: {color};")
+        # Layout fijo de la casilla: las piezas se añaden y se quitan de él
+        self.piece_layout = QVBoxLayout(self)
+        self.piece_layout.setContentsMargins(0, 0, 0, 0)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasText():
@@ -215,7 +151,12 @@ class ChessSquare(QLabel):
 
 class ChessBoard(QWidget):
     """Tablero de ajedrez interactivo"""
+    # Cada cuántos plies se guarda una copia del tablero para navegar
+    SNAPSHOT_INTERVAL = 16
+
     move_made = pyqtSignal(str)
+    # Milisegundos que tardó la última actualización de las piezas
+    frame_rendered = pyqtSignal(float)
 
     def __init__(self):
         super().__init__()
@@ -223,6 +164,8 @@ class ChessBoard(QWidget):
         self.squares = {}
         self.pieces = {}
         self.move_history = []
+        # Copias del tablero por ply (cada SNAPSHOT_INTERVAL) para saltos largos
+        self._snapshots = {0: self.board.copy()}
         self.current_animation = None
         self.initUI()
         self.placePieces()
@@ -275,49 +218,89 @@ class ChessBoard(QWidget):
 
     def _complete_move(self, move, move_san):
         """Completa un movimiento y actualiza el estado del juego"""
-        self.board.push(move)
+        self.push_move(move)
+        self.move_made.emit(move_san)
+
+    def push_move(self, move):
+        """Juega un movimiento en la posición actual; si se estaba navegando por
+        la partida, los movimientos posteriores se descartan"""
+        ply = len(self.board.move_stack)
+        del self.move_history[ply:]
+        for snapshot_ply in [p for p in self._snapshots if p > ply]:
+            del self._snapshots[snapshot_ply]
         self.move_history.append(move)
+        self._push(move)
         self.placePieces()
-        self.move_made.emit(move_san)
+
+    def _push(self, move):
+        self.board.push(move)
+        ply = len(self.board.move_stack)
+        if ply % self.SNAPSHOT_INTERVAL == 0 and ply not in self._snapshots:
+            self._snapshots[ply] = self.board.copy()
 
     def goto_position(self, move_index):
-        """Va a una posición específica en la historia de movimientos"""
-        self.board = chess.Board()
-        for i in range(move_index + 1):
-            if i < len(self.move_history):
-                self.board.push(self.move_history[i])
+        """Va a una posición específica en la historia de movimientos.
+
+        Avanza o retrocede desde la posición actual con push/pop; si el salto
+        es largo parte de la copia guardada más cercana, así que el coste no
+        depende de la longitud de la partida.
+        """
+        target = max(0, min(move_index + 1, len(self.move_history)))
+        current = len(self.board.move_stack)
+        if abs(target - current) > self.SNAPSHOT_INTERVAL:
+            base = max(ply for ply in self._snapshots if ply <= target)
+            if target - base < abs(target - current):
+                self.board = self._snapshots[base].copy()
+        while len(self.board.move_stack) > target:
+            self.board.pop()
+        while len(self.board.move_stack) < target:
+            self._push(self.move_history[len(self.board.move_stack)])
         self.placePieces()
 
     def placePieces(self):
-        """Coloca las piezas en el tablero"""
-        # Limpiar piezas existentes
-        for square in chess.SQUARES:
-            if self.squares[square].layout():
-                old_layout = self.squares[square].layout()
-                while old_layout.count():
-                    item = old_layout.takeAt(0)
-                    if item.widget():
-                        item.widget().deleteLater()
-                QWidget().setLayout(old_layout)
-
-        self.pieces.clear()
-
-        # Colocar nuevas piezas
+        """Actualiza las piezas comparando con lo que ya hay en el tablero.
+
+        Solo se tocan las casillas que cambian: las piezas que desaparecen de
+        una casilla se reutilizan en las que ganan una pieza del mismo tipo
+        (un movimiento mueve el widget en lugar de recrearlo) y solo se crean
+        o se borran las que sobran o faltan.
+        """
+        start_time = time.perf_counter()
+        changed = []
+        spare = {}
         for square in chess.SQUARES:
             piece = self.board.piece_at(square)
-            if piece:
-                chess_piece = ChessPiece(piece.symbol())
-                layout = QVBoxLayout()
-                layout.setContentsMargins(0, 0, 0, 0)
-                layout.addWidget(chess_piece)
-                self.squares[square].setLayout(layout)
-                self.pieces[square] = chess_piece
+            symbol = piece.symbol() if piece else None
+            current = self.pieces.get(square)
+            if current is not None and current.piece == symbol:
+                continue
+            if current is not None:
+                self.squares[square].piece_layout.removeWidget(current)
+                del self.pieces[square]
+                spare.setdefault(current.piece, []).append(current)
+            if symbol:
+                changed.append((square, symbol))
+
+        for square, symbol in changed:
+            reusable = spare.get(symbol)
+            chess_piece = reusable.pop() if reusable else ChessPiece(symbol)
+            self.squares[square].piece_layout.addWidget(chess_piece)
+            chess_piece.show()
+            self.pieces[square] = chess_piece
+
+        for widgets in spare.values():
+            for widget in widgets:
+                widget.hide()
+                widget.deleteLater()
+
+        self.frame_rendered.emit((time.perf_counter() - start_time) * 1000)
 
     def set_position_from_fen(self, fen: str):
         """Establece una posición a partir de una cadena FEN"""
         try:
             self.board = chess.Board(fen)
             self.move_history.clear()
+            self._snapshots = {0: self.board.copy()}
             self.placePieces()
         except ValueError as e:
             raise ValueError(f"FEN inválido: {str(e)}")
@@ -361,6 +344,11 @@ class MoveList(QWidget):
 
     def add_move(self, move_san):
         """Añade un movimiento a la lista"""
+        # Un movimiento desde una posición anterior sustituye al resto de la partida
+        if self.current_move < len(self.moves) - 1:
+            del self.moves[self.current_move + 1:]
+            while self.move_list.count() > len(self.moves):
+                self.move_list.takeItem(self.move_list.count() - 1)
         move_number = len(self.moves) // 2 + 1
         if len(self.moves) % 2 == 0:
             text = f"{move_number}. {move_san}"
@@ -467,6 +455,18 @@ class EngineControls(QWidget):
         depth_layout.addWidget(self.depth_spin)
         layout.addLayout(depth_layout)
         
+        # Control de tiempo (0 = sin límite, solo profundidad)
+        time_layout = QHBoxLayout()
+        self.time_spin = QDoubleSpinBox()
+        self.time_spin.setRange(0, 120)
+        self.time_spin.setSingleStep(0.5)
+        self.time_spin.setValue(0)
+        self.time_spin.setSuffix(" s")
+        self.time_spin.setSpecialValueText("Sin límite")
+        time_layout.addWidget(QLabel("Tiempo por jugada:"))
+        time_layout.addWidget(self.time_spin)
+        layout.addLayout(time_layout)
+        
         # Botón de análisis
         self.btn_analyze = QPushButton("Analizar Posición")
         self.btn_analyze.setStyleSheet("""
@@ -484,7 +484,14 @@ class EngineControls(QWidget):
                 background-color: #219a52;
             }
         """)
-        layout.addWidget(self.btn_analyze)
+        
+        # Botón para detener el análisis en curso
+        self.btn_stop = QPushButton("Detener")
+        self.btn_stop.setEnabled(False)
+        analyze_layout = QHBoxLayout()
+        analyze_layout.addWidget(self.btn_analyze)
+        analyze_layout.addWidget(self.btn_stop)
+        layout.addLayout(analyze_layout)
         
         # Panel de información del motor
         info_group = QGroupBox("Información del Análisis")
@@ -503,6 +510,52 @@ class EngineControls(QWidget):
         info_group.setLayout(info_layout)
         layout.addWidget(info_group)
 
+class AnalysisWorker(QThread):
+    """Ejecuta la búsqueda en un hilo aparte sobre una copia del tablero.
+
+    Emite `progress` tras cada iteración completa (profundidad, evaluación,
+    variante en SAN y nodos por segundo) y `search_finished` con el mejor
+    movimiento y su evaluación. stop() pide al motor que termine en cuanto
+    pueda; se devuelve la última iteración completa.
+    """
+    progress = pyqtSignal(int, float, str, int)
+    search_finished = pyqtSignal(object, float)
+    search_failed = pyqtSignal(str)
+
+    def __init__(self, engine, board: chess.Board, time_limit: Optional[float] = None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.board = board.copy()
+        self.fen = board.fen()
+        self.time_limit = time_limit
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_event.is_set()
+
+    def run(self):
+        time_manager = TimeManager.from_time_limit(self.time_limit, stop_event=self.stop_event)
+        self.engine.info_callback = self._report
+        try:
+            best_move, evaluation = self.engine.search(self.board, time_manager=time_manager)
+        except Exception as e:
+            self.search_failed.emit(str(e))
+            return
+        finally:
+            self.engine.info_callback = None
+        self.search_finished.emit(best_move, float(evaluation))
+
+    def _report(self, info):
+        """info_callback del motor: se ejecuta en este hilo y se envía por señal a la GUI."""
+        nodes = info.nodes_searched + info.positions_evaluated
+        nps = int(nodes / info.time_spent) if info.time_spent > 0 else 0
+        pv_text = self.board.variation_san(info.pv_line) if info.pv_line else ""
+        self.progress.emit(info.depth_reached, float(info.score), pv_text, nps)
+
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación"""
     def __init__(self):
@@ -516,6 +569,10 @@ class MainWindow(QMainWindow):
         #self.engine = ChessEngine(self.material_evaluator)
 
         self.engine = MinimaxEngine(self.material_evaluator, depth=3)
+        # Libro de aperturas local: se consulta antes de lanzar la búsqueda
+        self.opening_book = OpeningBook(DEFAULT_BOOK_PATH)
+        # Búsqueda en curso (AnalysisWorker) o None
+        self.analysis_worker = None
 
 
 
@@ -575,6 +632,7 @@ class MainWindow(QMainWindow):
         # Conectar señales
         self.engine_controls.btn_set_position.clicked.connect(self.set_position)
         self.engine_controls.btn_analyze.clicked.connect(self.analyze_position)
+        self.engine_controls.btn_stop.clicked.connect(self.stop_analysis)
         self.board.move_made.connect(self.move_list.add_move)
         self.move_list.move_selected.connect(self.board.goto_position)
         
@@ -606,67 +664,136 @@ class MainWindow(QMainWindow):
     def create_status_bar(self):
         """Crea la barra de estado"""
         self.statusBar().showMessage('Listo')
+        # Tiempo de la última actualización del tablero
+        self.frame_time_label = QLabel()
+        self.statusBar().addPermanentWidget(self.frame_time_label)
+        self.board.frame_rendered.connect(self.show_frame_time)
 
-    def analyze_position(self):
-        """Analiza la posición actual"""
-        try:
-            self.engine_controls.engine_info.setText("Analizando posición...")
-            self.statusBar().showMessage('Analizando...')
-            self.engine_controls.btn_analyze.setEnabled(False)
-            
-            QApplication.processEvents()
-            
-            depth = self.engine_controls.depth_spin.value()
-            self.engine.max_depth = depth  # Ahora esto funciona directamente
-            current_board = self.board.board
-            
-            # Debug prints
-            print(f"[DEBUG] Posición actual FEN: {current_board.fen()}")
-            print(f"[DEBUG] Turno actual: {'Negras' if current_board.turn == chess.BLACK else 'Blancas'}")
-            print(f"[DEBUG] Movimientos legales: {[current_board.san(move) for move in current_board.legal_moves]}")
-            
-            # Ahora llamamos directamente al motor
-            best_move, evaluation = self.engine.search(current_board)
-            
-            if best_move:
-                move_san = current_board.san(best_move)
-                if self.move_sound:
-                    self.move_sound.play()
-                QTimer.singleShot(500, lambda: self._complete_engine_move(
-                    best_move, move_san, current_board, evaluation))
-                
-                self.engine_controls.opening_label.setText("Apertura: (Fuera del libro)")
-                
-        except Exception as e:
-            self.statusBar().showMessage(f'Error: {str(e)}')
-            self.engine_controls.engine_info.setText(f"Error en el análisis: {str(e)}")
-            self.engine_controls.btn_analyze.setEnabled(True)
+    def show_frame_time(self, milliseconds):
+        self.frame_time_label.setText(f"Tablero: {milliseconds:.1f} ms")
 
-    def _complete_engine_move(self, move, move_san, current_board, evaluation):
+    def analyze_position(self):
+        """Lanza el análisis de la posición actual en segundo plano"""
+        if self.analysis_worker is not None:
+            return
+        current_board = self.board.board
+        if current_board.is_game_over():
+            self.statusBar().showMessage('La partida ha terminado')
+            return
+        
+        book_move, opening_info = self.opening_book.get_move(current_board)
+        if book_move is not None:
+            self._play_book_move(book_move, opening_info)
+            return
+        
+        self.engine_controls.engine_info.setText("Analizando posición...")
+        self.statusBar().showMessage('Analizando...')
+        self.engine_controls.btn_analyze.setEnabled(False)
+        self.engine_controls.btn_stop.setEnabled(True)
+        
+        self.engine.max_depth = self.engine_controls.depth_spin.value()
+        time_limit = self.engine_controls.time_spin.value() or None
+        
+        # El hilo trabaja sobre una copia: se puede seguir navegando por la partida
+        worker = AnalysisWorker(self.engine, current_board, time_limit, self)
+        worker.progress.connect(self._show_progress)
+        worker.search_finished.connect(self._analysis_finished)
+        worker.search_failed.connect(self._analysis_failed)
+        worker.finished.connect(worker.deleteLater)
+        self.analysis_worker = worker
+        worker.start()
+
+    def _play_book_move(self, move, opening_info):
+        """Juega un movimiento del libro sin buscar"""
+        fen = self.board.board.fen()
+        move_san = self.board.board.san(move)
+        self.engine_controls.opening_label.setText(f"Apertura: {opening_info}")
+        self.engine_controls.engine_info.setText(f"Movimiento del libro: {move_san}")
+        if self.move_sound:
+            self.move_sound.play()
+        QTimer.singleShot(500, lambda: self._complete_engine_move(move, move_san, fen))
+
+    def stop_analysis(self):
+        """Detiene el análisis en curso; se conserva la última iteración completa"""
+        if self.analysis_worker is not None:
+            self.analysis_worker.stop()
+            self.engine_controls.btn_stop.setEnabled(False)
+            self.statusBar().showMessage('Deteniendo análisis...')
+
+    def _show_progress(self, depth, evaluation, pv_text, nps):
+        """Muestra el resultado de cada iteración completa"""
+        self.engine_controls.engine_info.setText(
+            f"Profundidad: {depth}\n"
+            f"Evaluación: {self._format_evaluation(evaluation)}\n"
+            f"Variante: {pv_text}\n"
+            f"Nodos/s: {nps}"
+        )
+        self.statusBar().showMessage(f'Analizando... profundidad {depth}')
+
+    def _analysis_finished(self, best_move, evaluation):
+        """Recibe el resultado del hilo de análisis"""
+        worker = self.analysis_worker
+        self.analysis_worker = None
+        self.engine_controls.btn_analyze.setEnabled(True)
+        self.engine_controls.btn_stop.setEnabled(False)
+        
+        fen = worker.fen
+        info = self.engine.search_info
+        if best_move is None or info.depth_reached == 0:
+            self.statusBar().showMessage('Análisis detenido')
+            return
+        analyzed_board = chess.Board(fen)
+        move_san = analyzed_board.san(best_move)
+        pv = info.pv_line
+        pv_text = analyzed_board.variation_san(pv) if pv else move_san
+        self.engine_controls.engine_info.setText(
+            f"Mejor movimiento: {move_san}\n"
+            f"Evaluación: {self._format_evaluation(evaluation)}\n"
+            f"Profundidad: {info.depth_reached}\n"
+            f"Variante: {pv_text}"
+        )
+        self.engine_controls.opening_label.setText("Apertura: (Fuera del libro)")
+        
+        # Solo se juega si no se ha detenido y el tablero sigue en la posición analizada
+        if worker.stopped or self.board.board.fen() != fen:
+            self.statusBar().showMessage('Análisis completado')
+            return
+        if self.move_sound:
+            self.move_sound.play()
+        QTimer.singleShot(500, lambda: self._complete_engine_move(best_move, move_san, fen))
+
+    def _analysis_failed(self, message):
+        self.analysis_worker = None
+        self.engine_controls.btn_analyze.setEnabled(True)
+        self.engine_controls.btn_stop.setEnabled(False)
+        self.statusBar().showMessage(f'Error: {message}')
+        self.engine_controls.engine_info.setText(f"Error en el análisis: {message}")
+
+    def _format_evaluation(self, evaluation):
+        eval_text = "+" if evaluation > 0 else "" if evaluation == 0 else "-"
+        return eval_text + f"{abs(evaluation/100):.2f}"
+
+    def _complete_engine_move(self, move, move_san, fen):
         """Completa el movimiento del motor"""
         try:
-            current_board.push(move)
-            self.board.move_history.append(move)
-            self.board.placePieces()
+            # Durante la espera el usuario puede haber movido o navegado
+            if self.board.board.fen() != fen:
+                return
+            self.board.push_move(move)
             
             self.move_list.add_move(move_san)
-            
-            eval_text = "+" if evaluation > 0 else "" if evaluation == 0 else "-"
-            eval_text += f"{abs(evaluation/100):.2f}"
-            
-            analysis_text = (
-                f"Mejor movimiento: {move_san}\n"
-                f"Evaluación: {eval_text}\n"
-                f"Profundidad: {self.engine_controls.depth_spin.value()}"
-            )
-            self.engine_controls.engine_info.setText(analysis_text)
             self.statusBar().showMessage('Análisis completado')
             
         except Exception as e:
             self.statusBar().showMessage(f'Error al completar movimiento: {str(e)}')
             self.engine_controls.engine_info.setText("Error al ejecutar el movimiento")
-        finally:
-            self.engine_controls.btn_analyze.setEnabled(True)
+
+    def closeEvent(self, event):
+        """Detiene el hilo de análisis antes de cerrar"""
+        if self.analysis_worker is not None:
+            self.analysis_worker.stop()
+            self.analysis_worker.wait()
+        super().closeEvent(event)
 
     def set_position(self):
         """Establece una posición FEN"""
@@ -1,14 +1,13 @@
-from engine.evaluator.material import MaterialEvaluator
-from engine.search.minimax import MinimaxEngine
-import chess
+import os
+import sys
+
+# El motor vive en motor/search/minimax y usa imports relativos a esa carpeta
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'motor', 'search', 'minimax'))
+from uci import UCIEngine
 
 def main():
-    board = chess.Board()
-    evaluator = MaterialEvaluator()
-    engine = MinimaxEngine(evaluator, depth=3)
-    
-    # Implementar loop principal
-    pass
+    # Bucle UCI sobre stdin/stdout (para GUIs y gestores de torneos)
+    UCIEngine().run()
 
 if __name__ == "__main__":
     main()
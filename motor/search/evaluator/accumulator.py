@@ -0,0 +1,110 @@
+import chess
+from typing import List, Tuple
+
+class MaterialAccumulator:
+    """Material + tablas de posición (mediojuego y final) mantenidos de forma incremental.
+
+    Guarda, para la posición actual, la suma con signo (blancas - negras) de
+    valor de pieza + tabla de posición en mediojuego y en final, y el
+    material sin peones que determina la fase. Se actualiza con las
+    diferencias de cada movimiento en push/pop, de modo que el término de
+    material de la evaluación cuesta O(1) por nodo.
+    """
+    def __init__(self, evaluator):
+        tables = {
+            chess.PAWN: (evaluator.mg_pawn_table, evaluator.eg_pawn_table),
+            chess.KNIGHT: (evaluator.mg_knight_table, evaluator.eg_knight_table),
+            chess.BISHOP: (evaluator.mg_bishop_table, evaluator.eg_bishop_table),
+            chess.ROOK: (evaluator.mg_rook_table, evaluator.eg_rook_table),
+            chess.QUEEN: (evaluator.mg_queen_table, evaluator.eg_queen_table),
+            chess.KING: (evaluator.mg_king_table, evaluator.eg_king_table),
+        }
+        mg_values = evaluator.mg_piece_values.tolist()
+        eg_values = evaluator.eg_piece_values.tolist()
+
+        # Peso [tipo][color][casilla] con el signo del color ya aplicado
+        self.mg_weights: List[List[List[int]]] = [[[0] * 64, [0] * 64] for _ in range(7)]
+        self.eg_weights: List[List[List[int]]] = [[[0] * 64, [0] * 64] for _ in range(7)]
+        for piece_type, (mg_table, eg_table) in tables.items():
+            mg_table = mg_table.tolist()
+            eg_table = eg_table.tolist()
+            for square in chess.SQUARES:
+                self.mg_weights[piece_type][chess.WHITE][square] = mg_values[piece_type - 1] + mg_table[square]
+                self.eg_weights[piece_type][chess.WHITE][square] = eg_values[piece_type - 1] + eg_table[square]
+                mirror = chess.square_mirror(square)
+                self.mg_weights[piece_type][chess.BLACK][square] = -(mg_values[piece_type - 1] + mg_table[mirror])
+                self.eg_weights[piece_type][chess.BLACK][square] = -(eg_values[piece_type - 1] + eg_table[mirror])
+
+        # Material sin peones (caballo a dama) para la fase de juego
+        self.npm_values = [0, 0] + mg_values[1:5] + [0]
+        self.max_npm = (4 * mg_values[1] + 4 * mg_values[2] +
+                        4 * mg_values[3] + 2 * mg_values[4])
+        self.stack: List[Tuple[int, int, int]] = []
+
+    @property
+    def mg(self) -> int:
+        return self.stack[-1][0]
+
+    @property
+    def eg(self) -> int:
+        return self.stack[-1][1]
+
+    def game_phase(self) -> float:
+        """Fase del juego (0 = apertura, 1 = final), igual que MaterialEvaluator._get_game_phase."""
+        return 1.0 - min(1.0, self.stack[-1][2] / self.max_npm)
+
+    def reset(self, board: chess.Board):
+        """Calcula las sumas completas para la posición de partida."""
+        mg = eg = npm = 0
+        for color in chess.COLORS:
+            for piece_type in chess.PIECE_TYPES:
+                mg_weights = self.mg_weights[piece_type][color]
+                eg_weights = self.eg_weights[piece_type][color]
+                for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                    mg += mg_weights[square]
+                    eg += eg_weights[square]
+                    npm += self.npm_values[piece_type]
+        self.stack = [(mg, eg, npm)]
+
+    def push(self, board: chess.Board, move: chess.Move):
+        """Aplica las diferencias del movimiento (board todavía sin el movimiento)."""
+        mg, eg, npm = self.stack[-1]
+        if move:
+            us = board.turn
+            them = not us
+            from_square = move.from_square
+            to_square = move.to_square
+            piece_type = board.piece_type_at(from_square)
+            mg_weights = self.mg_weights
+            eg_weights = self.eg_weights
+
+            if piece_type == chess.KING and board.is_castling(move):
+                rank = chess.square_rank(from_square)
+                if board.is_kingside_castling(move):
+                    king_to, rook_from, rook_to = chess.square(6, rank), chess.square(7, rank), chess.square(5, rank)
+                else:
+                    king_to, rook_from, rook_to = chess.square(2, rank), chess.square(0, rank), chess.square(3, rank)
+                mg += (mg_weights[chess.KING][us][king_to] - mg_weights[chess.KING][us][from_square] +
+                       mg_weights[chess.ROOK][us][rook_to] - mg_weights[chess.ROOK][us][rook_from])
+                eg += (eg_weights[chess.KING][us][king_to] - eg_weights[chess.KING][us][from_square] +
+                       eg_weights[chess.ROOK][us][rook_to] - eg_weights[chess.ROOK][us][rook_from])
+            else:
+                new_type = move.promotion or piece_type
+                mg += mg_weights[new_type][us][to_square] - mg_weights[piece_type][us][from_square]
+                eg += eg_weights[new_type][us][to_square] - eg_weights[piece_type][us][from_square]
+                if move.promotion:
+                    npm += self.npm_values[new_type]
+
+                captured = board.piece_type_at(to_square)
+                captured_square = to_square
+                if not captured and piece_type == chess.PAWN and to_square == board.ep_square:
+                    captured = chess.PAWN
+                    captured_square = chess.square(chess.square_file(to_square), chess.square_rank(from_square))
+                if captured:
+                    mg -= mg_weights[captured][them][captured_square]
+                    eg -= eg_weights[captured][them][captured_square]
+                    npm -= self.npm_values[captured]
+        self.stack.append((mg, eg, npm))
+
+    def pop(self):
+        self.stack.pop()
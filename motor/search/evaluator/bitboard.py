@@ -0,0 +1,227 @@
+import chess
+from typing import List, Optional, Tuple
+
+from .material import MaterialEvaluator
+
+
+def _build_passed_masks() -> List[List[int]]:
+    """Casillas por delante en la columna propia y las adyacentes, por color."""
+    masks = [[0] * 64 for _ in chess.COLORS]
+    for square in chess.SQUARES:
+        file_idx = chess.square_file(square)
+        rank_idx = chess.square_rank(square)
+        files = 0
+        for f in (file_idx - 1, file_idx, file_idx + 1):
+            if 0 <= f < 8:
+                files |= chess.BB_FILES[f]
+        ahead_white = 0
+        for r in range(rank_idx + 1, 8):
+            ahead_white |= chess.BB_RANKS[r]
+        ahead_black = 0
+        for r in range(rank_idx):
+            ahead_black |= chess.BB_RANKS[r]
+        masks[chess.WHITE][square] = files & ahead_white
+        masks[chess.BLACK][square] = files & ahead_black
+    return masks
+
+
+def _build_shield_masks() -> List[List[int]]:
+    """Escudo de peones del rey: su fila y la siguiente, columnas adyacentes."""
+    masks = [[0] * 64 for _ in chess.COLORS]
+    for color in chess.COLORS:
+        base_rank = 0 if color == chess.WHITE else 7
+        direction = 1 if color == chess.WHITE else -1
+        for square in chess.SQUARES:
+            file_idx = chess.square_file(square)
+            rank_idx = chess.square_rank(square)
+            if abs(rank_idx - base_rank) > 2:
+                continue
+            mask = 0
+            for f in range(max(0, file_idx - 1), min(8, file_idx + 2)):
+                for r in (rank_idx, rank_idx + direction):
+                    if 0 <= r < 8:
+                        mask |= chess.BB_SQUARES[chess.square(f, r)]
+            masks[color][square] = mask
+    return masks
+
+
+PASSED_PAWN_MASKS = _build_passed_masks()
+SHIELD_MASKS = _build_shield_masks()
+ADJACENT_FILES = [
+    (chess.BB_FILES[f - 1] if f > 0 else 0) | (chess.BB_FILES[f + 1] if f < 7 else 0)
+    for f in range(8)
+]
+CENTRAL_FILE_FACTOR = [1.5 if 2 <= f <= 5 else 1.0 for f in range(8)]
+PASSED_FILE_FACTOR = [1.3 if 2 <= f <= 5 else 1.0 for f in range(8)]
+CENTER_BB = chess.BB_D4 | chess.BB_E4 | chess.BB_D5 | chess.BB_E5
+EXTENDED_CENTER_BB = (chess.BB_C3 | chess.BB_D3 | chess.BB_E3 | chess.BB_F3 |
+                      chess.BB_C4 | chess.BB_D4 | chess.BB_E4 | chess.BB_F4 |
+                      chess.BB_C5 | chess.BB_D5 | chess.BB_E5 | chess.BB_F5 |
+                      chess.BB_C6 | chess.BB_D6 | chess.BB_E6 | chess.BB_F6)
+
+
+def pawn_attacks(pawns: int, color: chess.Color) -> int:
+    """Casillas atacadas por un conjunto de peones, calculadas con desplazamientos."""
+    if color == chess.WHITE:
+        return (((pawns & ~chess.BB_FILE_A) << 7) | ((pawns & ~chess.BB_FILE_H) << 9)) & chess.BB_ALL
+    return ((pawns & ~chess.BB_FILE_H) >> 7) | ((pawns & ~chess.BB_FILE_A) >> 9)
+
+
+def attack_map(board: chess.Board, color: chess.Color) -> int:
+    """Unión de las casillas atacadas por todas las piezas de un color."""
+    attacks = pawn_attacks(board.pawns & board.occupied_co[color], color)
+    for square in chess.scan_forward(board.occupied_co[color] & ~board.pawns):
+        attacks |= board.attacks_mask(square)
+    return attacks
+
+
+class BitboardEvaluator(MaterialEvaluator):
+    """Versión de MaterialEvaluator que trabaja sobre bitboards.
+
+    Usa los mismos parámetros y produce las mismas puntuaciones, pero en
+    lugar de recorrer casillas con board.piece_at combina máscaras
+    precalculadas (peones pasados, columnas aisladas, escudo del rey) con
+    popcount. Solo genera movimientos legales para detectar mate y ahogado.
+    """
+    def __init__(self, pawn_hash_mb: float = 1):
+        super().__init__(pawn_hash_mb)
+        # Copias en listas de Python: indexar arrays de NumPy elemento a
+        # elemento es lento
+        self._mg_values = [0] + self.mg_piece_values.tolist()
+        self._eg_values = [0] + self.eg_piece_values.tolist()
+        self._tables = [None] + [
+            (mg.tolist(), eg.tolist()) for mg, eg in (
+                (self.mg_pawn_table, self.eg_pawn_table),
+                (self.mg_knight_table, self.eg_knight_table),
+                (self.mg_bishop_table, self.eg_bishop_table),
+                (self.mg_rook_table, self.eg_rook_table),
+                (self.mg_queen_table, self.eg_queen_table),
+                (self.mg_king_table, self.eg_king_table),
+            )
+        ]
+        v = self._mg_values
+        self._max_npm = 4 * v[chess.KNIGHT] + 4 * v[chess.BISHOP] + 4 * v[chess.ROOK] + 2 * v[chess.QUEEN]
+
+    def evaluate(self, board: chess.Board, hash_key: Optional[int] = None,
+                 pawn_key: Optional[int] = None) -> float:
+        """Evaluación principal de la posición."""
+        if not any(board.generate_legal_moves()):
+            if board.is_check():
+                return -20000 if board.turn else 20000
+            return 0
+        if board.is_insufficient_material():
+            return 0
+
+        material, game_phase = self._material_and_phase(board)
+        white_attacks = attack_map(board, chess.WHITE)
+        black_attacks = attack_map(board, chess.BLACK)
+
+        score = (
+            material +
+            self._evaluate_pawn_structure(board, pawn_key) +
+            self._evaluate_mobility(board, game_phase) +
+            self._evaluate_center_control_bb(board, white_attacks, black_attacks) +
+            self._evaluate_king_safety(board, game_phase)
+        )
+        return score if board.turn == chess.WHITE else -score
+
+    def _get_game_phase(self, board: chess.Board) -> float:
+        """Calcula la fase del juego."""
+        v = self._mg_values
+        npm = (chess.popcount(board.knights) * v[chess.KNIGHT] +
+               chess.popcount(board.bishops) * v[chess.BISHOP] +
+               chess.popcount(board.rooks) * v[chess.ROOK] +
+               chess.popcount(board.queens) * v[chess.QUEEN])
+        return 1.0 - min(1.0, npm / self._max_npm)
+
+    def _evaluate_material_and_position(self, board: chess.Board, game_phase: float) -> float:
+        """Evalúa material y valor posicional."""
+        mg_weight = 1 - game_phase
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
+        score = 0.0
+        for piece_type in chess.PIECE_TYPES:
+            mg_table, eg_table = self._tables[piece_type]
+            piece_value = mg_weight * self._mg_values[piece_type] + game_phase * self._eg_values[piece_type]
+            pieces = board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK)
+
+            mg_sum = 0
+            eg_sum = 0
+            for square in chess.scan_forward(pieces & white):
+                mg_sum += mg_table[square]
+                eg_sum += eg_table[square]
+            for square in chess.scan_forward(pieces & black):
+                mg_sum -= mg_table[square ^ 56]
+                eg_sum -= eg_table[square ^ 56]
+
+            count = chess.popcount(pieces & white) - chess.popcount(pieces & black)
+            score += count * piece_value + mg_weight * mg_sum + game_phase * eg_sum
+
+        return score + self._evaluate_bishop_pair(board, game_phase)
+
+    def _compute_pawn_structure(self, board: chess.Board) -> Tuple[float, int, int]:
+        """Estructura de peones con máscaras de columna y de peón pasado."""
+        white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+        black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+        white_score, white_passed = self._pawn_side_score(white_pawns, black_pawns, chess.WHITE)
+        black_score, black_passed = self._pawn_side_score(black_pawns, white_pawns, chess.BLACK)
+        return white_score - black_score, white_passed, black_passed
+
+    def _pawn_side_score(self, own: int, enemy: int, color: chess.Color) -> Tuple[float, int]:
+        score = 0.0
+        passed = 0
+        for file_idx in range(8):
+            count = chess.popcount(own & chess.BB_FILES[file_idx])
+            if not count:
+                continue
+            if count > 1:
+                score += count * self.doubled_pawn_penalty * CENTRAL_FILE_FACTOR[file_idx]
+            if 0 < file_idx < 7 and not own & ADJACENT_FILES[file_idx]:
+                score += count * self.isolated_pawn_penalty * CENTRAL_FILE_FACTOR[file_idx]
+
+        passed_masks = PASSED_PAWN_MASKS[color]
+        pawn_attack_table = chess.BB_PAWN_ATTACKS[color]
+        for square in chess.scan_forward(own):
+            if not passed_masks[square] & enemy:
+                rank_idx = square >> 3 if color == chess.WHITE else 7 - (square >> 3)
+                score += self.passed_pawn_bonus[rank_idx] * PASSED_FILE_FACTOR[square & 7]
+                passed |= chess.BB_SQUARES[square]
+            # Retrasado: ningún peón propio en las casillas diagonales de delante
+            if not pawn_attack_table[square] & own:
+                score += self.backward_pawn_penalty
+        return score, passed
+
+    def _evaluate_center_control_bb(self, board: chess.Board, white_attacks: int,
+                                    black_attacks: int) -> float:
+        """Control del centro a partir de la ocupación y los mapas de ataque."""
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
+        popcount = chess.popcount
+        return (
+            15 * (popcount(white & CENTER_BB) - popcount(black & CENTER_BB)) +
+            8 * (popcount(white_attacks & CENTER_BB) - popcount(black_attacks & CENTER_BB)) +
+            7 * (popcount(white & EXTENDED_CENTER_BB) - popcount(black & EXTENDED_CENTER_BB)) +
+            3 * (popcount(white_attacks & EXTENDED_CENTER_BB) - popcount(black_attacks & EXTENDED_CENTER_BB))
+        )
+
+    def _evaluate_king_safety(self, board: chess.Board, game_phase: float) -> float:
+        """Seguridad del rey con la máscara de escudo y los ataques del rey."""
+        score = 0.0
+        if game_phase < 0.8:
+            for color in chess.COLORS:
+                king_square = board.king(color)
+                # Igual que MaterialEvaluator: un rey en a1 (casilla 0) no se evalúa
+                if not king_square:
+                    continue
+                multiplier = 1 if color == chess.WHITE else -1
+                own = board.occupied_co[color]
+
+                shield = 10 * chess.popcount(SHIELD_MASKS[color][king_square] & board.pawns & own)
+                score += multiplier * shield * (1 - game_phase)
+
+                attacks = chess.popcount(chess.BB_KING_ATTACKS[king_square] & board.occupied_co[not color])
+                score += multiplier * -20 * attacks * (1 - game_phase)
+
+                if game_phase < 0.5 and 2 <= (king_square & 7) <= 5 and (king_square >> 3) <= 2:
+                    score += multiplier * -30
+        return score
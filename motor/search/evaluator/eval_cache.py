@@ -0,0 +1,64 @@
+import chess
+import numpy as np
+from typing import Optional
+
+class EvalCache:
+    """Caché de evaluaciones de tamaño fijo que envuelve cualquier evaluador.
+
+    Se indexa con la clave Zobrist que ya calcula la búsqueda (`hash_key &
+    mask`), así que no añade ningún cálculo de hash; sin clave se limita a
+    delegar en el evaluador envuelto. Cada índice guarda una sola entrada
+    y siempre se reemplaza.
+    """
+    accepts_hash_keys = True
+
+    ENTRY_DTYPE = np.dtype([
+        ('key', '<u8'),
+        ('score', '<f8'),
+    ])
+
+    def __init__(self, evaluator, size_mb: float = 4):
+        self.evaluator = evaluator
+        self._inner_keyed = getattr(evaluator, 'accepts_hash_keys', False)
+        max_entries = max(1, int(size_mb * 1024 * 1024) // self.ENTRY_DTYPE.itemsize)
+        self.size = 1 << (max_entries.bit_length() - 1)
+        self.mask = self.size - 1
+        self.entries = np.zeros(self.size, dtype=self.ENTRY_DTYPE)
+        self._keys = self.entries['key']
+        self._scores = self.entries['score']
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # El resto de atributos (tablas, pawn_table, ...) son los del evaluador envuelto
+        evaluator = self.__dict__.get('evaluator')
+        if evaluator is None:
+            raise AttributeError(name)
+        return getattr(evaluator, name)
+
+    def evaluate(self, board: chess.Board, hash_key: Optional[int] = None,
+                 pawn_key: Optional[int] = None) -> float:
+        """Devuelve la evaluación cacheada para hash_key o la calcula y la guarda."""
+        if hash_key is None:
+            return self._evaluate_inner(board, pawn_key)
+
+        index = hash_key & self.mask
+        if self._keys.item(index) == hash_key:
+            self.hits += 1
+            return self._scores.item(index)
+
+        self.misses += 1
+        score = self._evaluate_inner(board, pawn_key)
+        self._keys[index] = hash_key
+        self._scores[index] = score
+        return score
+
+    def _evaluate_inner(self, board: chess.Board, pawn_key: Optional[int]) -> float:
+        if self._inner_keyed:
+            return self.evaluator.evaluate(board, pawn_key=pawn_key)
+        return self.evaluator.evaluate(board)
+
+    def clear(self):
+        self.entries.fill(0)
+        self.hits = 0
+        self.misses = 0
@@ -1,9 +1,16 @@
 import chess
 import numpy as np
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Set, List, Optional, Tuple
+
+from .mobility import MobilityEvaluator
+from .pawn_hash import PawnHashTable
+from .accumulator import MaterialAccumulator
 
 class MaterialEvaluator:
-    def __init__(self):
+    # La búsqueda pasa sus claves Zobrist (posición y peones) a evaluate()
+    accepts_hash_keys = True
+
+    def __init__(self, pawn_hash_mb: float = 1):
         # Valores base de piezas (en centipawns)
         self.mg_piece_values = np.array([100, 325, 335, 500, 975, 20000])
         self.eg_piece_values = np.array([145, 315, 325, 550, 1000, 20000])
@@ -161,6 +168,15 @@ class MaterialEvaluator:
             chess.ROOK: (3, 6),
             chess.QUEEN: (2, 4)
         }
+        self.mobility_evaluator = MobilityEvaluator(
+            self.mobility_bonus, self.rook_open_file_bonus, self.rook_semi_open_bonus)
+        
+        # Caché de estructura de peones
+        self.pawn_table = PawnHashTable(pawn_hash_mb)
+        
+        # Material y tablas de posición incrementales durante la búsqueda
+        self.accumulator = MaterialAccumulator(self)
+        self._accumulator_board = None
         
         # Control del centro
         self.central_squares = {chess.E4, chess.D4, chess.E5, chess.D5}
@@ -171,20 +187,25 @@ class MaterialEvaluator:
             chess.C6, chess.D6, chess.E6, chess.F6
         }
         
-    def evaluate(self, board: chess.Board) -> float:
-        """Evaluación principal de la posición."""
+    def evaluate(self, board: chess.Board, hash_key: Optional[int] = None,
+                 pawn_key: Optional[int] = None) -> float:
+        """Evaluación principal de la posición.
+
+        hash_key y pawn_key son las claves Zobrist que mantiene la búsqueda;
+        pawn_key indexa la tabla de peones (si falta se deriva de los bitboards).
+        """
         if board.is_checkmate():
             return -20000 if board.turn else 20000
         if board.is_stalemate() or board.is_insufficient_material():
             return 0
             
-        # Determinar fase del juego
-        game_phase = self._get_game_phase(board)
+        # Material, posición y fase del juego
+        material, game_phase = self._material_and_phase(board)
         
         # Evaluación desde perspectiva de las blancas
         score = (
-            self._evaluate_material_and_position(board, game_phase) +
-            self._evaluate_pawn_structure(board) +
+            material +
+            self._evaluate_pawn_structure(board, pawn_key) +
             self._evaluate_mobility(board, game_phase) +
             self._evaluate_center_control(board) +
             self._evaluate_king_safety(board, game_phase)
@@ -193,6 +214,34 @@ class MaterialEvaluator:
         # IMPORTANTE: Ya no invertimos el score basado en el turno
         return score if board.turn == chess.WHITE else -score
         
+    def begin_search(self, board: chess.Board):
+        """Activa el acumulador incremental para `board` (lo llama la búsqueda)."""
+        self.accumulator.reset(board)
+        self._accumulator_board = board
+        
+    def push(self, board: chess.Board, move: chess.Move):
+        """Actualiza el acumulador antes de que la búsqueda ejecute `move`."""
+        if board is self._accumulator_board:
+            self.accumulator.push(board, move)
+            
+    def pop(self):
+        """Deshace la última actualización del acumulador."""
+        if self._accumulator_board is not None:
+            self.accumulator.pop()
+            
+    def end_search(self):
+        self._accumulator_board = None
+        
+    def _material_and_phase(self, board: chess.Board) -> Tuple[float, float]:
+        """Material + posición y fase, del acumulador si está activo para este tablero."""
+        if board is self._accumulator_board:
+            accumulator = self.accumulator
+            game_phase = accumulator.game_phase()
+            score = ((1 - game_phase) * accumulator.mg + game_phase * accumulator.eg +
+                     self._evaluate_bishop_pair(board, game_phase))
+            return score, game_phase
+        game_phase = self._get_game_phase(board)
+        return self._evaluate_material_and_position(board, game_phase), game_phase
         
     def _get_game_phase(self, board: chess.Board) -> float:
         """Calcula la fase del juego."""
@@ -237,17 +286,40 @@ class MaterialEvaluator:
                 eg_pos_score = eg_table[chess.square_mirror(square)]
                 score -= (1 - game_phase) * mg_pos_score + game_phase * eg_pos_score
         
-        # Bonus por par de alfiles (ajustado según la fase)
-        if len(board.pieces(chess.BISHOP, chess.WHITE)) >= 2:
+        return score + self._evaluate_bishop_pair(board, game_phase)
+        
+    def _evaluate_bishop_pair(self, board: chess.Board, game_phase: float) -> float:
+        """Bonus por par de alfiles (ajustado según la fase)."""
+        score = 0
+        if chess.popcount(board.bishops & board.occupied_co[chess.WHITE]) >= 2:
             score += self.bishop_pair_bonus * (1 + game_phase)
-        if len(board.pieces(chess.BISHOP, chess.BLACK)) >= 2:
+        if chess.popcount(board.bishops & board.occupied_co[chess.BLACK]) >= 2:
             score -= self.bishop_pair_bonus * (1 + game_phase)
-            
         return score
         
-    def _evaluate_pawn_structure(self, board: chess.Board) -> float:
-        """Evaluación mejorada de la estructura de peones."""
+    def _evaluate_pawn_structure(self, board: chess.Board, pawn_key: Optional[int] = None) -> float:
+        """Estructura de peones, consultando primero la tabla hash de peones."""
+        white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+        black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+        if pawn_key is None:
+            pawn_key = hash((white_pawns, black_pawns))
+        
+        entry = self.pawn_table.probe(pawn_key, white_pawns, black_pawns)
+        if entry is not None:
+            return entry[0]
+        
+        score, white_passed, black_passed = self._compute_pawn_structure(board)
+        self.pawn_table.store(pawn_key, white_pawns, black_pawns, score, white_passed, black_passed)
+        return score
+        
+    def _compute_pawn_structure(self, board: chess.Board) -> Tuple[float, int, int]:
+        """Evaluación mejorada de la estructura de peones.
+
+        Devuelve el score y las máscaras de peones pasados blancos y negros.
+        """
         score = 0
+        white_passed = 0
+        black_passed = 0
         white_pawns = board.pieces(chess.PAWN, chess.WHITE)
         black_pawns = board.pieces(chess.PAWN, chess.BLACK)
         
@@ -272,6 +344,7 @@ class MaterialEvaluator:
             if self._is_passed_pawn(board, square, chess.WHITE):
                 central_file_bonus = 1.3 if 2 <= file_idx <= 5 else 1.0
                 score += self.passed_pawn_bonus[rank_idx] * central_file_bonus
+                white_passed |= chess.BB_SQUARES[square]
                 
             # Peones retrasados
             if self._is_backward_pawn(board, square, chess.WHITE):
@@ -295,42 +368,16 @@ class MaterialEvaluator:
             if self._is_passed_pawn(board, square, chess.BLACK):
                 central_file_bonus = 1.3 if 2 <= file_idx <= 5 else 1.0
                 score -= self.passed_pawn_bonus[rank_idx] * central_file_bonus
+                black_passed |= chess.BB_SQUARES[square]
                 
             if self._is_backward_pawn(board, square, chess.BLACK):
                 score -= self.backward_pawn_penalty
                 
-        return score
+        return score, white_passed, black_passed
         
     def _evaluate_mobility(self, board: chess.Board, game_phase: float) -> float:
-        """Evaluación mejorada de movilidad."""
-        score = 0
-        
-        for color in [chess.WHITE, chess.BLACK]:
-            multiplier = 1 if color == chess.WHITE else -1
-            
-            for piece_type in [chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]:
-                mg_bonus, eg_bonus = self.mobility_bonus[piece_type]
-                for square in board.pieces(piece_type, color):
-                    # Calcular movimientos legales reales
-                    moves = 0
-                    for move in board.legal_moves:
-                        if move.from_square == square:
-                            moves += 1
-                    
-                    # Bonus de movilidad ajustado por fase
-                    mobility_bonus = (1 - game_phase) * mg_bonus + game_phase * eg_bonus
-                    score += multiplier * moves * mobility_bonus
-                    
-                    # Bonus especial para torres en columnas abiertas o semi-abiertas
-                    if piece_type == chess.ROOK:
-                        file_idx = chess.square_file(square)
-                        if not any(chess.square_file(s) == file_idx for s in board.pieces(chess.PAWN, color)):
-                            if not any(chess.square_file(s) == file_idx for s in board.pieces(chess.PAWN, not color)):
-                                score += multiplier * self.rook_open_file_bonus
-                            else:
-                                score += multiplier * self.rook_semi_open_bonus
-                    
-        return score
+        """Evaluación de movilidad (ambos colores, por bitboards de ataque)."""
+        return self.mobility_evaluator.evaluate(board, game_phase)
         
     def _evaluate_center_control(self, board: chess.Board) -> float:
         """Evaluación mejorada del control del centro."""
@@ -1,6 +1,52 @@
 import chess
+from typing import Dict, Optional, Tuple
 
 class MobilityEvaluator:
-    def __init__(self):
-        # Implementar evaluación de movilidad
-        pass
+    """Movilidad de caballos, alfiles, torres y damas a partir de bitboards de ataque.
+
+    Cuenta para ambos colores las casillas atacadas que no ocupa una pieza
+    propia (board.attacks_mask), sin generar movimientos legales, e incluye
+    el bonus de torres en columnas abiertas o semiabiertas.
+    """
+    MOBILITY_PIECES = (chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+    def __init__(self, mobility_bonus: Optional[Dict[int, Tuple[int, int]]] = None,
+                 rook_open_file_bonus: int = 50, rook_semi_open_bonus: int = 25):
+        self.mobility_bonus = mobility_bonus or {
+            chess.KNIGHT: (4, 5),    # (mediojuego, final)
+            chess.BISHOP: (5, 5),
+            chess.ROOK: (3, 6),
+            chess.QUEEN: (2, 4)
+        }
+        self.rook_open_file_bonus = rook_open_file_bonus
+        self.rook_semi_open_bonus = rook_semi_open_bonus
+
+    def evaluate(self, board: chess.Board, game_phase: float) -> float:
+        """Movilidad desde la perspectiva de las blancas."""
+        score = 0.0
+        popcount = chess.popcount
+        for color in chess.COLORS:
+            multiplier = 1 if color == chess.WHITE else -1
+            own = board.occupied_co[color]
+            targets = ~own
+            own_pawns = board.pawns & own
+            enemy_pawns = board.pawns & ~own
+
+            for piece_type in self.MOBILITY_PIECES:
+                mg_bonus, eg_bonus = self.mobility_bonus[piece_type]
+                bonus = (1 - game_phase) * mg_bonus + game_phase * eg_bonus
+                moves = 0
+                for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                    moves += popcount(board.attacks_mask(square) & targets)
+
+                    # Bonus especial para torres en columnas abiertas o semiabiertas
+                    if piece_type == chess.ROOK:
+                        file_mask = chess.BB_FILES[square & 7]
+                        if not own_pawns & file_mask:
+                            if not enemy_pawns & file_mask:
+                                score += multiplier * self.rook_open_file_bonus
+                            else:
+                                score += multiplier * self.rook_semi_open_bonus
+                score += multiplier * moves * bonus
+
+        return score
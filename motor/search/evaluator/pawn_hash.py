@@ -0,0 +1,57 @@
+import numpy as np
+from typing import Optional, Tuple
+
+class PawnHashTable:
+    """Caché de tamaño fijo de la evaluación de estructura de peones.
+
+    Se indexa con una clave de peones (`pawn_key & mask`) y cada entrada
+    guarda los dos bitboards de peones, de modo que una colisión de índice
+    nunca devuelve la puntuación de otra estructura. Además del score se
+    guardan las máscaras de peones pasados de cada color.
+    """
+    ENTRY_DTYPE = np.dtype([
+        ('white_pawns', '<u8'),
+        ('black_pawns', '<u8'),
+        ('score', '<f8'),
+        ('white_passed', '<u8'),
+        ('black_passed', '<u8'),
+    ])
+
+    def __init__(self, size_mb: float = 1):
+        max_entries = max(1, int(size_mb * 1024 * 1024) // self.ENTRY_DTYPE.itemsize)
+        self.size = 1 << (max_entries.bit_length() - 1)
+        self.mask = self.size - 1
+        # Una entrada vacía equivale a "sin peones", cuyo score y máscaras son 0
+        self.entries = np.zeros(self.size, dtype=self.ENTRY_DTYPE)
+        self._white_pawns = self.entries['white_pawns']
+        self._black_pawns = self.entries['black_pawns']
+        self._scores = self.entries['score']
+        self._white_passed = self.entries['white_passed']
+        self._black_passed = self.entries['black_passed']
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, pawn_key: int, white_pawns: int, black_pawns: int) -> Optional[Tuple[float, int, int]]:
+        """Devuelve (score, pasados blancos, pasados negros) o None si no está."""
+        index = pawn_key & self.mask
+        if self._white_pawns.item(index) == white_pawns and self._black_pawns.item(index) == black_pawns:
+            self.hits += 1
+            return (self._scores.item(index), self._white_passed.item(index),
+                    self._black_passed.item(index))
+        self.misses += 1
+        return None
+
+    def store(self, pawn_key: int, white_pawns: int, black_pawns: int,
+              score: float, white_passed: int, black_passed: int):
+        """Guarda una entrada (siempre reemplaza)."""
+        index = pawn_key & self.mask
+        self._white_pawns[index] = white_pawns
+        self._black_pawns[index] = black_pawns
+        self._scores[index] = score
+        self._white_passed[index] = white_passed
+        self._black_passed[index] = black_passed
+
+    def clear(self):
+        self.entries.fill(0)
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,170 @@
+"""Análisis por lotes de posiciones con MinimaxEngine.
+
+Lee posiciones de un fichero (FENs separados por punto y coma o por líneas
+como FENs.txt, EPD o PGN), las reparte entre un pool de procesos, cada uno
+con su propio MinimaxEngine + MaterialEvaluator, y escribe un resultado JSON
+por línea a medida que terminan. Las posiciones se leen de forma perezosa y
+solo hay unas pocas tareas en vuelo a la vez, así que la memoria no depende
+del tamaño de la entrada.
+
+Uso:
+    python batch_analysis.py FENs.txt -o resultados.jsonl --workers 4 --depth 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterator, Optional, Tuple
+
+import chess
+import chess.pgn
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from minimaxengine import MinimaxEngine
+from evaluator.material import MaterialEvaluator
+
+
+def read_fen_text(path: str) -> Iterator[Tuple[str, str]]:
+    """Posiciones separadas por ';' o saltos de línea; ignora el texto que no es FEN."""
+    index = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            for chunk in line.split(';'):
+                chunk = chunk.strip()
+                if chunk.count('/') != 7:
+                    continue
+                try:
+                    board = chess.Board(chunk)
+                except ValueError:
+                    continue
+                index += 1
+                yield str(index), board.fen()
+
+
+def read_epd(path: str) -> Iterator[Tuple[str, str]]:
+    """Posiciones EPD, usando la operación 'id' como identificador si existe."""
+    index = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                board, ops = chess.Board.from_epd(line)
+            except ValueError:
+                continue
+            index += 1
+            yield str(ops.get('id', index)), board.fen()
+
+
+def read_pgn(path: str) -> Iterator[Tuple[str, str]]:
+    """Posición final de la línea principal de cada partida."""
+    index = 0
+    with open(path, encoding='utf-8') as f:
+        while True:
+            game = chess.pgn.read_game(f)
+            if game is None:
+                break
+            index += 1
+            headers = game.headers
+            ident = f"{index}: {headers.get('White', '?')} - {headers.get('Black', '?')}"
+            yield ident, game.end().board().fen()
+
+
+def read_positions(path: str) -> Iterator[Tuple[str, str]]:
+    """Elige el lector según la extensión del fichero."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pgn':
+        return read_pgn(path)
+    if extension == '.epd':
+        return read_epd(path)
+    return read_fen_text(path)
+
+
+# Motor de cada proceso del pool (uno por proceso)
+_worker_engine: Optional[MinimaxEngine] = None
+
+def _init_worker(depth: int, tt_size_mb: int):
+    global _worker_engine
+    _worker_engine = MinimaxEngine(MaterialEvaluator(), depth=depth, tt_size_mb=tt_size_mb)
+
+def _analyze(ident: str, fen: str, time_limit: Optional[float]) -> dict:
+    engine = _worker_engine
+    # Posiciones independientes: el resultado no debe depender de qué analizó antes este proceso
+    engine.new_game()
+    board = chess.Board(fen)
+    start_time = time.time()
+    best_move, score = engine.search(board, time_limit)
+    elapsed = time.time() - start_time
+    info = engine.search_info
+    # Nodos como en la salida UCI: incluidos los de quiescencia
+    nodes = info.nodes_searched + info.positions_evaluated
+    return {
+        'id': ident,
+        'fen': fen,
+        'best_move': best_move.uci() if best_move else None,
+        'score': float(score) if best_move else None,
+        'depth': engine.depth_completed,
+        'pv': [move.uci() for move in info.pv_line or []],
+        'nodes': nodes,
+        'nps': int(nodes / elapsed) if elapsed > 0 else 0,
+        'time': round(elapsed, 3),
+    }
+
+
+def analyze_file(path: str, output, workers: int = 4, depth: int = 3,
+                 time_limit: Optional[float] = None, tt_size_mb: int = 16) -> int:
+    """Analiza todas las posiciones de `path` y escribe JSONL en `output`.
+
+    Devuelve el número de posiciones analizadas.
+    """
+    positions = read_positions(path)
+    max_in_flight = workers * 2
+    done_count = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(depth, tt_size_mb)) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            # Rellenar hasta el máximo de tareas en vuelo
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    ident, fen = next(positions)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_analyze, ident, fen, time_limit))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                output.write(json.dumps(future.result()) + '\n')
+                output.flush()
+                done_count += 1
+    return done_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis por lotes de posiciones")
+    parser.add_argument('input', help="Fichero de posiciones (.txt con FENs, .epd o .pgn)")
+    parser.add_argument('-o', '--output', help="Fichero JSONL de salida (por defecto stdout)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--time-limit', type=float, default=None, help="Segundos por posición")
+    parser.add_argument('--hash', type=int, default=16, help="MB de tabla de transposición por proceso")
+    args = parser.parse_args()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        start_time = time.time()
+        count = analyze_file(args.input, output, args.workers, args.depth, args.time_limit, args.hash)
+        print(f"{count} posiciones analizadas en {time.time() - start_time:.2f} segundos", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+import chess
+import random
+import time
+import sys
+import os
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+from evaluator.material import MaterialEvaluator
+from evaluator.bitboard import BitboardEvaluator
+from evaluator.mobility import MobilityEvaluator
+from minimax.zobrist_hash import ZobristHash, ZobristTracker
+from minimax.minimaxengine import MinimaxEngine
+
+FENS_FILE = os.path.join(os.path.dirname(os.path.dirname(project_root)), 'FENs.txt')
+
+def load_fens(path: str = FENS_FILE):
+    """Lee las posiciones de FENs.txt (separadas por ';' o por líneas)."""
+    fens = []
+    with open(path, encoding='utf-8') as f:
+        for chunk in f.read().replace('\n', ';').split(';'):
+            chunk = chunk.strip()
+            if chunk.count('/') == 7:
+                fens.append(chunk)
+    return fens
+
+def build_corpus(plies: int = 60, seed: int = 1):
+    """Posiciones de FENs.txt más partidas aleatorias cortas desde cada una."""
+    rng = random.Random(seed)
+    corpus = []
+    for fen in load_fens():
+        board = chess.Board(fen)
+        for _ in range(plies):
+            corpus.append(board.copy(stack=False))
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+    return corpus
+
+def time_per_eval(evaluator, corpus):
+    """Microsegundos medios por evaluación sobre el corpus."""
+    start_time = time.perf_counter()
+    for board in corpus:
+        evaluator.evaluate(board)
+    return (time.perf_counter() - start_time) / len(corpus) * 1e6
+
+def bench_evaluators():
+    """Comprueba que BitboardEvaluator coincide con MaterialEvaluator y compara su velocidad."""
+    corpus = build_corpus()
+    reference = MaterialEvaluator()
+    fast = BitboardEvaluator()
+
+    mismatches = 0
+    for board in corpus:
+        expected = reference.evaluate(board)
+        actual = fast.evaluate(board)
+        if abs(expected - actual) > 1e-6:
+            mismatches += 1
+            print(f"Diferencia en {board.fen()}: {expected} != {actual}")
+
+    print(f"\nPosiciones comparadas: {len(corpus)}, diferencias: {mismatches}")
+    reference_time = time_per_eval(reference, corpus)
+    fast_time = time_per_eval(fast, corpus)
+    print(f"MaterialEvaluator: {reference_time:.1f} us/evaluación")
+    print(f"BitboardEvaluator: {fast_time:.1f} us/evaluación")
+    print(f"Aceleración: {reference_time / fast_time:.1f}x")
+
+def legacy_mobility(evaluator, board: chess.Board, game_phase: float) -> float:
+    """Movilidad anterior a MobilityEvaluator: movimientos legales por pieza, solo del bando al turno."""
+    score = 0
+    for color in [chess.WHITE, chess.BLACK]:
+        multiplier = 1 if color == chess.WHITE else -1
+        for piece_type in [chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]:
+            mg_bonus, eg_bonus = evaluator.mobility_bonus[piece_type]
+            for square in board.pieces(piece_type, color):
+                moves = 0
+                for move in board.legal_moves:
+                    if move.from_square == square:
+                        moves += 1
+                mobility_bonus = (1 - game_phase) * mg_bonus + game_phase * eg_bonus
+                score += multiplier * moves * mobility_bonus
+                if piece_type == chess.ROOK:
+                    file_idx = chess.square_file(square)
+                    if not any(chess.square_file(s) == file_idx for s in board.pieces(chess.PAWN, color)):
+                        if not any(chess.square_file(s) == file_idx for s in board.pieces(chess.PAWN, not color)):
+                            score += multiplier * evaluator.rook_open_file_bonus
+                        else:
+                            score += multiplier * evaluator.rook_semi_open_bonus
+    return score
+
+def bench_mobility():
+    """Tiempo del término de movilidad y de la evaluación completa antes/después de MobilityEvaluator."""
+    corpus = build_corpus()
+    evaluator = MaterialEvaluator()
+    mobility = MobilityEvaluator()
+    phases = [evaluator._get_game_phase(board) for board in corpus]
+
+    start_time = time.perf_counter()
+    for board, phase in zip(corpus, phases):
+        legacy_mobility(evaluator, board, phase)
+    legacy_time = (time.perf_counter() - start_time) / len(corpus) * 1e6
+
+    start_time = time.perf_counter()
+    for board, phase in zip(corpus, phases):
+        mobility.evaluate(board, phase)
+    attack_time = (time.perf_counter() - start_time) / len(corpus) * 1e6
+
+    print(f"\nMovilidad (movimientos legales): {legacy_time:.1f} us/evaluación")
+    print(f"Movilidad (bitboards de ataque): {attack_time:.1f} us/evaluación")
+
+    # Evaluación completa con el término antiguo frente al nuevo
+    original_mobility = MaterialEvaluator._evaluate_mobility
+    MaterialEvaluator._evaluate_mobility = legacy_mobility
+    try:
+        before = time_per_eval(evaluator, corpus)
+    finally:
+        MaterialEvaluator._evaluate_mobility = original_mobility
+    after = time_per_eval(evaluator, corpus)
+    print(f"MaterialEvaluator completo antes: {before:.1f} us/evaluación")
+    print(f"MaterialEvaluator completo después: {after:.1f} us/evaluación")
+
+def bench_accumulator(plies: int = 80, seed: int = 1):
+    """Compara el acumulador incremental de material/posición con el cálculo completo."""
+    rng = random.Random(seed)
+    zobrist = ZobristHash()
+    checked = mismatches = 0
+    incremental_time = full_time = 0.0
+    for evaluator in (MaterialEvaluator(), BitboardEvaluator()):
+        for fen in load_fens():
+            board = chess.Board(fen)
+            evaluator.begin_search(board)
+            tracker = ZobristTracker(zobrist, board, listeners=[evaluator])
+            for _ in range(plies):
+                start_time = time.perf_counter()
+                incremental, phase = evaluator._material_and_phase(board)
+                incremental_time += time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                expected_phase = evaluator._get_game_phase(board)
+                expected = evaluator._evaluate_material_and_position(board, expected_phase)
+                full_time += time.perf_counter() - start_time
+
+                checked += 1
+                if abs(incremental - expected) > 1e-6 or abs(phase - expected_phase) > 1e-12:
+                    mismatches += 1
+                    print(f"Diferencia en {board.fen()}: {incremental} != {expected}")
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                tracker.push(rng.choice(moves))
+            while board.move_stack:
+                tracker.pop()
+            evaluator.end_search()
+
+    print(f"\nPosiciones comparadas: {checked}, diferencias: {mismatches}")
+    print(f"Material+PST completo: {full_time / checked * 1e6:.1f} us/nodo")
+    print(f"Material+PST incremental: {incremental_time / checked * 1e6:.1f} us/nodo")
+
+def bench_terminal(plies: int = 80, seed: int = 1):
+    """Detección de finales: is_game_over frente a la historia de claves Zobrist."""
+    rng = random.Random(seed)
+    zobrist = ZobristHash()
+    checked = mismatches = 0
+    game_over_time = fast_time = 0.0
+    for fen in load_fens():
+        board = chess.Board(fen)
+        tracker = ZobristTracker(zobrist, board)
+        for _ in range(plies):
+            # Antes: is_game_over y otra generación para ordenar los movimientos
+            start_time = time.perf_counter()
+            game_over = board.is_game_over(claim_draw=True)
+            moves = list(board.legal_moves)
+            game_over_time += time.perf_counter() - start_time
+
+            # Ahora: repetición por claves, reloj de 50 movimientos y una sola generación
+            start_time = time.perf_counter()
+            draw = (tracker.is_repetition() or board.halfmove_clock >= 100
+                    or (not (board.pawns | board.rooks | board.queens)
+                        and board.is_insufficient_material()))
+            fast_moves = list(board.legal_moves)
+            fast_time += time.perf_counter() - start_time
+
+            checked += 1
+            # is_game_over exige triple repetición; aquí basta con una
+            if (draw or not fast_moves) != game_over and not tracker.is_repetition():
+                mismatches += 1
+                print(f"Diferencia en {board.fen()}")
+            if not moves:
+                break
+            tracker.push(rng.choice(moves))
+        while board.move_stack:
+            tracker.pop()
+
+    print(f"\nPosiciones comparadas: {checked}, diferencias: {mismatches}")
+    print(f"is_game_over + generación: {game_over_time / checked * 1e6:.1f} us/nodo")
+    print(f"Historia de claves + generación: {fast_time / checked * 1e6:.1f} us/nodo")
+
+def search_positions(fens, **engine_options):
+    """Busca cada posición con un motor nuevo; devuelve resultados, nodos, evaluaciones y tiempo."""
+    results = []
+    nodes = evaluated = researches = 0
+    start_time = time.perf_counter()
+    for fen in fens:
+        engine = MinimaxEngine(BitboardEvaluator(), **engine_options)
+        move, value = engine.search(chess.Board(fen))
+        results.append((move, round(value, 2)))
+        nodes += engine.search_info.nodes_searched
+        evaluated += engine.search_info.positions_evaluated
+        researches += engine.search_info.aspiration_researches
+    return results, nodes, evaluated, time.perf_counter() - start_time, researches
+
+def bench_pvs(depth: int = 4, positions: int = 16):
+    """Nodos hasta la misma profundidad con ventana completa y con PVS."""
+    fens = load_fens()[:positions]
+    full, full_nodes, full_evaluated, full_time, _ = search_positions(
+        fens, depth=depth, use_pvs=False, use_aspiration=False)
+    pvs, pvs_nodes, pvs_evaluated, pvs_time, _ = search_positions(
+        fens, depth=depth, use_pvs=True, use_aspiration=False)
+
+    different = sum(a != b for a, b in zip(full, pvs))
+    print(f"\nPosiciones: {len(fens)}, profundidad: {depth}, resultados distintos: {different}")
+    print(f"Ventana completa: {full_nodes} nodos, {full_evaluated} evaluaciones, {full_time:.1f} s")
+    print(f"PVS: {pvs_nodes} nodos, {pvs_evaluated} evaluaciones, {pvs_time:.1f} s")
+    print(f"Reducción de nodos totales: "
+          f"{1 - (pvs_nodes + pvs_evaluated) / (full_nodes + full_evaluated):.1%}")
+
+def bench_aspiration(depth: int = 5, positions: int = 16):
+    """Tiempo hasta la misma profundidad con ventana completa y con ventanas de aspiración."""
+    fens = load_fens()[:positions]
+    full, full_nodes, full_evaluated, full_time, _ = search_positions(
+        fens, depth=depth, use_aspiration=False)
+    asp, asp_nodes, asp_evaluated, asp_time, researches = search_positions(
+        fens, depth=depth, use_aspiration=True)
+
+    different = sum(a[0] != b[0] for a, b in zip(full, asp))
+    print(f"\nPosiciones: {len(fens)}, profundidad: {depth}, mejor jugada distinta: {different}")
+    print(f"Ventana completa: {full_nodes + full_evaluated} nodos, {full_time:.1f} s")
+    print(f"Aspiración: {asp_nodes + asp_evaluated} nodos, {asp_time:.1f} s, {researches} re-búsquedas")
+
+def bench_ordering(depth: int = 4, positions: int = 16):
+    """Ordenación de la lista completa frente al MovePicker por etapas."""
+    fens = load_fens()[:positions]
+    full, full_nodes, full_evaluated, full_time, _ = search_positions(
+        fens, depth=depth, use_move_picker=False)
+    staged, staged_nodes, staged_evaluated, staged_time, _ = search_positions(
+        fens, depth=depth, use_move_picker=True)
+
+    different = sum(a[0] != b[0] for a, b in zip(full, staged))
+    full_total = full_nodes + full_evaluated
+    staged_total = staged_nodes + staged_evaluated
+    print(f"\nPosiciones: {len(fens)}, profundidad: {depth}, mejor jugada distinta: {different}")
+    print(f"Lista ordenada: {full_total} nodos, {full_time:.1f} s, "
+          f"{full_time / full_total * 1e6:.1f} us/nodo")
+    print(f"Por etapas:     {staged_total} nodos, {staged_time:.1f} s, "
+          f"{staged_time / staged_total * 1e6:.1f} us/nodo")
+
+def tactical_fens(min_captures: int = 2):
+    """Posiciones de FENs.txt en las que el bando al turno tiene varias capturas."""
+    return [fen for fen in load_fens()
+            if sum(1 for _ in chess.Board(fen).generate_legal_captures()) >= min_captures]
+
+def bench_quiescence(depth: int = 3):
+    """Nodos de quiescencia con y sin poda por SEE y delta pruning."""
+    fens = tactical_fens()
+    plain, plain_nodes, plain_qnodes, plain_time, _ = search_positions(
+        fens, depth=depth, use_qsearch_pruning=False)
+    pruned, pruned_nodes, pruned_qnodes, pruned_time, _ = search_positions(
+        fens, depth=depth, use_qsearch_pruning=True)
+
+    different = sum(a[0] != b[0] for a, b in zip(plain, pruned))
+    print(f"\nPosiciones tácticas: {len(fens)}, profundidad: {depth}, mejor jugada distinta: {different}")
+    print(f"Sin poda: {plain_nodes} nodos, {plain_qnodes} nodos de quiescencia, {plain_time:.1f} s")
+    print(f"SEE + delta: {pruned_nodes} nodos, {pruned_qnodes} nodos de quiescencia, {pruned_time:.1f} s")
+
+def bench_parallel(depth: int = 5, positions: int = 8):
+    """Tiempo hasta la misma profundidad con search y con search_parallel (2-16 procesos)."""
+    fens = load_fens()[:positions]
+    cores = os.cpu_count() or 1
+    worker_counts = [workers for workers in (2, 4, 8, 16) if workers <= cores] or [2]
+
+    def run(workers):
+        engine = MinimaxEngine(BitboardEvaluator(), depth=depth)
+        results = []
+        start_time = time.perf_counter()
+        try:
+            for fen in fens:
+                # Cada posición desde cero: la TT de una no debe ayudar a la siguiente
+                engine.tt.clear()
+                board = chess.Board(fen)
+                if workers == 1:
+                    results.append(engine.search(board)[0])
+                else:
+                    results.append(engine.search_parallel(board, workers=workers)[0])
+        finally:
+            engine.close()
+        return results, time.perf_counter() - start_time
+
+    serial, serial_time = run(1)
+    print(f"\nPosiciones: {len(fens)}, profundidad: {depth}, núcleos: {cores}")
+    print(f"{'Procesos':<10} {'Tiempo':>8} {'Aceleración':>12} {'Jugada distinta':>16}")
+    print(f"{'serie':<10} {serial_time:>7.1f}s {1.0:>11.2f}x {0:>16}")
+    for workers in worker_counts:
+        results, elapsed = run(workers)
+        different = sum(a != b for a, b in zip(serial, results))
+        print(f"{workers:<10} {elapsed:>7.1f}s {serial_time / elapsed:>11.2f}x {different:>16}")
+
+SELECTIVITY_OPTIONS = ('use_check_extensions', 'use_futility', 'use_reverse_futility',
+                       'use_lmp', 'use_lmr_table')
+
+def bench_selectivity(depth: int = 5, positions: int = 16):
+    """Nodos hasta la misma profundidad sin selectividad, con cada técnica por separado y con todas."""
+    fens = load_fens()[:positions]
+    none = {option: False for option in SELECTIVITY_OPTIONS}
+    configs = [('ninguna', none)]
+    configs += [(option[4:], dict(none, **{option: True})) for option in SELECTIVITY_OPTIONS]
+    configs.append(('todas', {option: True for option in SELECTIVITY_OPTIONS}))
+
+    print(f"\nPosiciones: {len(fens)}, profundidad: {depth}")
+    print(f"{'Técnica':<18} {'Nodos':>9} {'Tiempo':>8} {'Jugada distinta':>16}")
+    reference = None
+    for name, options in configs:
+        results, nodes, evaluated, elapsed, _ = search_positions(fens, depth=depth, **options)
+        if reference is None:
+            reference = results
+        different = sum(a[0] != b[0] for a, b in zip(reference, results))
+        print(f"{name:<18} {nodes + evaluated:>9} {elapsed:>7.1f}s {different:>16}")
+
+BENCHMARKS = {
+    'eval': bench_evaluators,
+    'mobility': bench_mobility,
+    'accumulator': bench_accumulator,
+    'terminal': bench_terminal,
+    'pvs': bench_pvs,
+    'aspiration': bench_aspiration,
+    'ordering': bench_ordering,
+    'quiescence': bench_quiescence,
+    'selectivity': bench_selectivity,
+    'parallel': bench_parallel,
+}
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print("=" * 50)
+        print(f"Benchmark: {name}")
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,22 @@
-from typing import Optional, Tuple, List
+from typing import Callable, Optional, Tuple, List
 import os
+import math
 import chess
-import time
 from dataclasses import dataclass
-import numpy as np
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 
 
 # Obtener la ruta absoluta del directorio raíz del proyecto
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-print(project_root)
 sys.path.append(project_root)
 
 from evaluator.material import MaterialEvaluator
-from minimax.zobrist_hash import ZobristHash, TranspositionTable   
+from evaluator.eval_cache import EvalCache
+from minimax.zobrist_hash import ZobristHash, ZobristTracker, TranspositionTable, SharedTranspositionTable
+from minimax.time_manager import TimeManager, SearchAborted
+from minimax.move_ordering import MovePicker, SEE_VALUES, PROMOTION_RANKS, mvv_lva, losing_capture
 
 @dataclass
 class SearchInfo:
@@ -22,18 +25,79 @@ class SearchInfo:
     time_spent: float = 0.0
     depth_reached: int = 0
     pv_line: List[chess.Move] = None
+    pawn_hash_hits: int = 0
+    pawn_hash_misses: int = 0
+    eval_cache_hits: int = 0
+    eval_cache_misses: int = 0
+    aspiration_researches: int = 0
+    score: float = 0.0
 
 class MinimaxEngine:
-    def __init__(self, evaluator, depth=3, tt_size_mb=32):
+    def __init__(self, evaluator, depth=3, tt_size_mb=32, debug_hash=False,
+                 tt: Optional[TranspositionTable] = None, eval_cache_mb: float = 4,
+                 use_pvs: bool = True, use_aspiration: bool = True, use_move_picker: bool = True,
+                 use_qsearch_pruning: bool = True, use_check_extensions: bool = True,
+                 use_futility: bool = True, use_reverse_futility: bool = True,
+                 use_lmp: bool = True, use_lmr_table: bool = True):
+        # Caché de evaluaciones indexada por la clave Zobrist de la búsqueda
+        if eval_cache_mb and not isinstance(evaluator, EvalCache):
+            evaluator = EvalCache(evaluator, eval_cache_mb)
         self.evaluator = evaluator
         self.max_depth = depth
         self.search_info = SearchInfo()
         self.MATE_SCORE = 20000
         self.DRAW_SCORE = 0
+        # Cota finita de las ventanas: con infinitos, la ventana nula
+        # (-beta, -beta + 1) de null move quedaría vacía
+        self.INFINITY = 2 * self.MATE_SCORE
         
         # Inicializar Zobrist Hashing y Tabla de Transposición
         self.zobrist = ZobristHash()
-        self.tt = TranspositionTable(tt_size_mb)
+        self.tt_size_mb = tt_size_mb
+        self.tt = tt if tt is not None else TranspositionTable(tt_size_mb)
+        # Hash incremental de la búsqueda en curso (debug_hash contrasta cada
+        # actualización con el recálculo completo)
+        self.debug_hash = debug_hash
+        self.hasher = None
+        # Los evaluadores con accepts_hash_keys reciben las claves de la búsqueda
+        self._keyed_eval = getattr(evaluator, 'accepts_hash_keys', False)
+        
+        # Principal Variation Search: los movimientos tras el primero se
+        # buscan con ventana nula y solo se repiten si la superan
+        self.use_pvs = use_pvs
+        # Ventanas de aspiración en la raíz a partir de esta profundidad
+        self.use_aspiration = use_aspiration
+        self.aspiration_min_depth = 3
+        
+        # Generación por etapas (MovePicker) en los nodos internos; con False
+        # se ordena la lista completa con _order_moves
+        self.use_move_picker = use_move_picker
+        # Quiescencia: descarta las capturas que pierden material (SEE) y las
+        # que ni ganando la pieza capturada llegarían a alfa (delta pruning)
+        self.use_qsearch_pruning = use_qsearch_pruning
+        self.DELTA_MARGIN = 200
+        
+        # Selectividad de _minimax, cada técnica por separado para poder medirla
+        # Extensión de un ply en las posiciones con jaque
+        self.use_check_extensions = use_check_extensions
+        # Futility: cerca de las hojas no se prueban movimientos tranquilos si
+        # la evaluación estática más el margen no llega a alfa
+        self.use_futility = use_futility
+        self.FUTILITY_MARGINS = (0, 200, 350, 500)
+        # Reverse futility: si la evaluación estática menos el margen supera
+        # beta, el nodo se da por cortado sin buscar
+        self.use_reverse_futility = use_reverse_futility
+        self.REVERSE_FUTILITY_MARGIN = 120
+        self.REVERSE_FUTILITY_DEPTH = 3
+        # Late move pruning: movimientos tranquilos que se prueban por profundidad
+        self.use_lmp = use_lmp
+        self.LMP_COUNTS = (0, 6, 10, 16)
+        # Reducciones LMR según profundidad y número de movimiento; con False
+        # se reduce siempre un ply
+        self.use_lmr_table = use_lmr_table
+        self._lmr_table = [[0] + [int(0.75 + math.log(d) * math.log(m) / 2.25) if d else 0
+                                  for m in range(1, 64)]
+                           for d in range(64)]
         
         # Movimientos asesinos (killer moves)
         self.killer_moves = [[None] * 2 for _ in range(32)]
@@ -41,23 +105,66 @@ class MinimaxEngine:
         # Historia heurística
         self.history_table = {}
         
-    def _order_moves(self, board: chess.Board, depth: int, tt_move: Optional[chess.Move] = None) -> List[chess.Move]:
+        # Lazy SMP: helper_id > 0 identifica a los procesos auxiliares, que
+        # perturban el orden en la raíz y se detienen con stop_event
+        self.helper_id = 0
+        self.stop_event = None
+        self._aborted = False
+        # Presupuesto de la búsqueda en curso; tick() se llama en cada nodo
+        self.time_manager = TimeManager()
+        self._smp_pool = None
+        self._smp_threads = 0
+        self._smp_stop_event = None
+        # Pool de la búsqueda con reparto de la raíz (search_parallel)
+        self._split_pool = None
+        self._split_workers = 0
+        self._split_stop_event = None
+        # Opciones con las que se crearon los motores del pool
+        self._split_options = None
+        self._smp_options = None
+        # Método de arranque de los procesos de los pools (None = el de la
+        # plataforma). Con 'fork', un proceso nuevo cierra sys.stdin y se
+        # bloquea si otro hilo está leyendo de él, como el bucle UCI
+        self.mp_start_method: Optional[str] = None
+        
+        # Tabla triangular de variantes principales: _pv_table[ply] es la
+        # mejor línea encontrada desde el nodo a esa distancia de la raíz
+        self.MAX_PLY = 128
+        self._pv_table: List[List[chess.Move]] = [[] for _ in range(self.MAX_PLY + 1)]
+        # PV de la iteración anterior y si el nodo actual está sobre ella
+        self._previous_pv: List[chess.Move] = []
+        self._follow_pv = False
+        # Pila de movimientos y PV de la última búsqueda, para continuar su
+        # variante si la nueva posición sale de ella (jugada propia + respuesta)
+        self._last_root_stack: List[chess.Move] = []
+        self._last_pv: List[chess.Move] = []
+        # Se llama con search_info tras cada iteración completa
+        self.info_callback: Optional[Callable[[SearchInfo], None]] = None
+        
+    def _order_moves(self, board: chess.Board, depth: int, tt_move: Optional[chess.Move] = None,
+                     pv_move: Optional[chess.Move] = None) -> List[chess.Move]:
         moves = list(board.legal_moves)
         move_scores = []
         
         for move in moves:
             score = 0
             
+            # El movimiento de la PV anterior va primero
+            if pv_move and move == pv_move:
+                score += 20000
+            
             # Prioridad al movimiento de la TT
             if tt_move and move == tt_move:
                 score += 10000
                 
-            # MVV-LVA para capturas
+            # MVV-LVA para capturas; las que pierden material (SEE) al final
             if board.is_capture(move):
                 victim = board.piece_at(move.to_square)
                 attacker = board.piece_at(move.from_square)
                 if victim and attacker:
                     score += (victim.piece_type * 10 - attacker.piece_type)
+                if losing_capture(board, move):
+                    score -= 100
             
             # Killer moves
             if depth < len(self.killer_moves) and (
@@ -82,71 +189,494 @@ class MinimaxEngine:
         
         return [move for move, _ in sorted(move_scores, key=lambda x: x[1], reverse=True)]
         
-    def search(self, board: chess.Board, time_limit: Optional[float] = None) -> Tuple[chess.Move, float]:
+    def search(self, board: chess.Board, time_limit: Optional[float] = None,
+               time_manager: Optional[TimeManager] = None) -> Tuple[chess.Move, float]:
+        """Profundización iterativa hasta max_depth o hasta agotar el tiempo.
+
+        time_limit es un tope en segundos por jugada; time_manager permite
+        pasar un presupuesto de reloj (TimeManager.from_clock). Si la
+        búsqueda se aborta se devuelve el resultado de la última iteración
+        completa.
+        """
+        if time_manager is None:
+            time_manager = TimeManager.from_time_limit(time_limit, self.stop_event)
+        self.time_manager = time_manager
+        self._start_tracking(board)
+        try:
+            return self._search(board)
+        finally:
+            self._stop_tracking()
+
+    def _start_tracking(self, board: chess.Board):
+        """Prepara el hash incremental (y el estado incremental del evaluador) para `board`."""
+        listeners = []
+        if hasattr(self.evaluator, 'begin_search'):
+            self.evaluator.begin_search(board)
+            listeners.append(self.evaluator)
+        self.hasher = ZobristTracker(self.zobrist, board, debug=self.debug_hash, listeners=listeners)
+
+    def _stop_tracking(self):
+        if hasattr(self.evaluator, 'end_search'):
+            self.evaluator.end_search()
+
+    def _search(self, board: chess.Board) -> Tuple[chess.Move, float]:
         self.search_info = SearchInfo()
-        start_time = time.time()
+        self.time_manager.start()
+        cache_counts = self._cache_counts()
+        self._aborted = False
+        if self.helper_id == 0:
+            # La TT, los killers y la historia se conservan entre jugadas;
+            # solo se envejecen
+            self.tt.new_search()
+            self._age_history()
         
         best_move = None
         best_value = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
+        root_ply = len(board.move_stack)
+        self._previous_pv = self._carried_pv(board)
+        self.search_info.pv_line = []
         
         for current_depth in range(1, self.max_depth + 1):
             self.search_info.depth_reached = current_depth
             
-            # Por esto:
-            if current_depth >= 2:
-                window_size = 30 + abs(best_value) * 0.1  # Ventana dinámica
-                alpha = max(best_value - window_size, float('-inf'))
-                beta = min(best_value + window_size, float('inf'))
-            
-            value = float('-inf')
-            current_alpha = alpha
-            
-            hash_key = self.zobrist.compute_hash(board)
+            hash_key = self.hasher.key
             tt_entry = self.tt.lookup(hash_key)
             tt_move = tt_entry[3] if tt_entry else None
             
-            moves = self._order_moves(board, current_depth, tt_move)
+            moves = self._order_moves(board, current_depth, tt_move,
+                                      self._previous_pv[0] if self._previous_pv else None)
+            if self.helper_id and len(moves) > 2:
+                # Cada auxiliar recorre los movimientos tras el primero en otro orden
+                shift = 1 + self.helper_id % (len(moves) - 1)
+                moves = moves[:1] + moves[shift:] + moves[1:shift]
+            if best_move is None and moves:
+                # Respaldo por si ni siquiera termina la primera iteración
+                best_move = moves[0]
             
-            for move in moves:
-                board.push(move)
-                # Negamax: siempre buscamos el máximo del negativo
-                value = -self._minimax(board, current_depth - 1, -beta, -current_alpha, not board.turn)
-                board.pop()
-                
-                if value > current_alpha:
-                    current_alpha = value
-                    if value > best_value:
-                        best_value = value
-                        best_move = move
-                        self.tt.store(hash_key, value, current_depth, TranspositionTable.EXACT, move)
-                
-                if current_alpha >= beta:
-                    break
-                
-                if time_limit and (time.time() - start_time) > time_limit:
-                    break
+            try:
+                if (self.use_aspiration and current_depth >= self.aspiration_min_depth
+                        and abs(best_value) < self.MATE_SCORE - 100):
+                    iteration_move, iteration_value = self._aspiration_search(
+                        board, moves, current_depth, best_value)
+                else:
+                    iteration_move, iteration_value = self._search_root(
+                        board, moves, current_depth, -self.INFINITY, self.INFINITY)
+            except SearchAborted:
+                # Deshacer los movimientos que quedaron aplicados en la rama abortada
+                while len(board.move_stack) > root_ply:
+                    self.hasher.pop()
+                self._aborted = True
+                break
+            
+            if iteration_move is not None:
+                best_move, best_value = iteration_move, iteration_value
+                self.tt.store(hash_key, self._value_to_tt(best_value, 0), current_depth,
+                              TranspositionTable.EXACT, best_move)
+                self._report_iteration(board, best_value, list(self._pv_table[0]), current_depth)
                     
-            if time_limit and (time.time() - start_time) > time_limit:
+            if self.time_manager.soft_expired():
                 break
                     
-        self.search_info.time_spent = time.time() - start_time
+        self.search_info.time_spent = self.time_manager.search_elapsed()
+        self._record_cache_counts(cache_counts)
+        self._last_root_stack = list(board.move_stack)
+        self._last_pv = list(self.search_info.pv_line)
+        return best_move, best_value if board.turn else -best_value
+
+    def _age_history(self):
+        """Divide por dos la historia heurística para que pese más lo reciente."""
+        self.history_table = {key: value >> 1 for key, value in self.history_table.items() if value > 1}
+
+    def new_game(self):
+        """Olvida lo aprendido en búsquedas anteriores: TT, killers, historia y PV."""
+        self.tt.clear()
+        self.killer_moves = [[None] * 2 for _ in range(32)]
+        self.history_table = {}
+        self._last_root_stack = []
+        self._last_pv = []
+
+    def _carried_pv(self, board: chess.Board) -> List[chess.Move]:
+        """Resto de la PV anterior si `board` se alcanza jugando sus primeros movimientos."""
+        played = len(board.move_stack) - len(self._last_root_stack)
+        if played <= 0 or played >= len(self._last_pv):
+            return []
+        if board.move_stack[:len(self._last_root_stack)] != self._last_root_stack:
+            return []
+        if board.move_stack[-played:] != self._last_pv[:played]:
+            return []
+        return self._last_pv[played:]
+
+    def _report_iteration(self, board: chess.Board, value: float, pv: List[chess.Move], depth: int):
+        """Anota en search_info el resultado de una iteración completa y avisa a info_callback."""
+        pv = self._complete_pv(board, pv, depth)
+        self._previous_pv = pv
+        info = self.search_info
+        info.pv_line = pv
+        info.score = value if board.turn else -value
+        info.time_spent = self.time_manager.search_elapsed()
+        if self.info_callback is not None and self.helper_id == 0:
+            self.info_callback(info)
+
+    def _value_to_tt(self, value: float, ply: int) -> float:
+        """Las puntuaciones de mate se guardan relativas al nodo, no a la raíz."""
+        if self.MATE_SCORE - self.MAX_PLY <= value <= self.MATE_SCORE:
+            return value + ply
+        if -self.MATE_SCORE <= value <= -self.MATE_SCORE + self.MAX_PLY:
+            return value - ply
+        return value
+
+    def _value_from_tt(self, value: float, ply: int) -> float:
+        """Inversa de _value_to_tt: mate relativo al nodo a distancia desde la raíz actual."""
+        if self.MATE_SCORE - self.MAX_PLY <= value <= self.MATE_SCORE:
+            return value - ply
+        if -self.MATE_SCORE <= value <= -self.MATE_SCORE + self.MAX_PLY:
+            return value + ply
+        return value
+
+    def _complete_pv(self, board: chess.Board, pv: List[chess.Move], depth: int) -> List[chess.Move]:
+        """Alarga con los movimientos de la TT una PV cortada por un acierto de la tabla."""
+        pv = list(pv)
+        board = board.copy(stack=False)
+        for move in pv:
+            board.push(move)
+        seen = set()
+        while len(pv) < depth:
+            key = self.zobrist.compute_hash(board)
+            if key in seen:
+                break  # repetición: la tabla nos devolvería en círculo
+            seen.add(key)
+            tt_entry = self.tt.lookup(key)
+            move = tt_entry[3] if tt_entry else None
+            if move is None or not board.is_legal(move):
+                break
+            pv.append(move)
+            board.push(move)
+        return pv
+
+    def _aspiration_search(self, board: chess.Board, moves: List[chess.Move], depth: int,
+                           previous_value: float) -> Tuple[Optional[chess.Move], float]:
+        """Busca la raíz con una ventana alrededor de previous_value.
+
+        Si el resultado cae fuera (fail-low o fail-high) se ensancha ese lado
+        de la ventana, duplicando el margen, y se repite; a partir de
+        MATE_SCORE / 10 de margen se usa la ventana completa.
+        """
+        # La evaluación varía del orden de 50 entre iteraciones; con márgenes
+        # menores casi un tercio de las iteraciones necesita repetirse
+        delta = 60 + abs(previous_value) * 0.1
+        alpha = max(previous_value - delta, -self.INFINITY)
+        beta = min(previous_value + delta, self.INFINITY)
+        while True:
+            move, value = self._search_root(board, moves, depth, alpha, beta)
+            if value <= alpha and alpha > -self.INFINITY:
+                # Fail-low: el valor real es como mucho alpha
+                beta = (alpha + beta) / 2
+                alpha = max(value - delta, -self.INFINITY)
+            elif value >= beta and beta < self.INFINITY:
+                # Fail-high: el valor real es al menos beta
+                beta = min(value + delta, self.INFINITY)
+            else:
+                return move, value
+            self.search_info.aspiration_researches += 1
+            delta *= 2
+            if delta > self.MATE_SCORE / 10:
+                alpha, beta = -self.INFINITY, self.INFINITY
+
+    def _search_root(self, board: chess.Board, moves: List[chess.Move], depth: int,
+                     alpha: float, beta: float) -> Tuple[Optional[chess.Move], float]:
+        """Una iteración en la raíz con PVS; devuelve (mejor movimiento, valor)."""
+        best_move = None
+        best_value = float('-inf')
+        self._pv_table[0] = []
+        for i, move in enumerate(moves):
+            # Solo la primera rama sigue la PV de la iteración anterior
+            self._follow_pv = (i == 0 and bool(self._previous_pv) and move == self._previous_pv[0])
+            self.hasher.push(move)
+            if i == 0 or not self.use_pvs:
+                value = -self._minimax(board, depth - 1, -beta, -alpha, 1)
+            else:
+                value = -self._minimax(board, depth - 1, -alpha - 1, -alpha, 1)
+                if alpha < value < beta:
+                    value = -self._minimax(board, depth - 1, -beta, -alpha, 1)
+            self.hasher.pop()
+            
+            if value > best_value:
+                best_value = value
+                best_move = move
+                if value > alpha:
+                    alpha = value
+                    self._pv_table[0] = [move] + self._pv_table[1]
+            
+            if alpha >= beta:
+                break
+        return best_move, best_value
+
+    def _evaluate(self, board: chess.Board) -> float:
+        """Evalúa la posición actual pasando las claves Zobrist si el evaluador las usa."""
+        if self._keyed_eval:
+            return self.evaluator.evaluate(board, hash_key=self.hasher.key,
+                                           pawn_key=self.hasher.pawn_key)
+        return self.evaluator.evaluate(board)
+
+    def _cache_counts(self) -> Tuple[int, int, int, int]:
+        """Aciertos y fallos acumulados de la tabla de peones y de la caché de evaluación."""
+        counts = [0, 0, 0, 0]
+        pawn_table = getattr(self.evaluator, 'pawn_table', None)
+        if pawn_table is not None:
+            counts[0], counts[1] = pawn_table.hits, pawn_table.misses
+        if isinstance(self.evaluator, EvalCache):
+            counts[2], counts[3] = self.evaluator.hits, self.evaluator.misses
+        return tuple(counts)
+
+    def _record_cache_counts(self, start_counts: Tuple[int, int, int, int]):
+        """Anota en SearchInfo los aciertos/fallos de las cachés desde start_counts."""
+        counts = self._cache_counts()
+        info = self.search_info
+        info.pawn_hash_hits = counts[0] - start_counts[0]
+        info.pawn_hash_misses = counts[1] - start_counts[1]
+        info.eval_cache_hits = counts[2] - start_counts[2]
+        info.eval_cache_misses = counts[3] - start_counts[3]
+
+    @property
+    def depth_completed(self) -> int:
+        """Última iteración de la búsqueda anterior que terminó sin interrumpirse."""
+        return self.search_info.depth_reached - (1 if self._aborted else 0)
+
+    def search_smp(self, board: chess.Board, threads: int = 2,
+                   time_limit: Optional[float] = None,
+                   time_manager: Optional[TimeManager] = None) -> Tuple[chess.Move, float]:
+        """Búsqueda Lazy SMP: el proceso principal y threads-1 auxiliares
+        ejecutan la profundización iterativa sobre una tabla de transposición
+        compartida y se devuelve el resultado completo más profundo."""
+        if time_manager is None:
+            time_manager = TimeManager.from_time_limit(time_limit, self.stop_event)
+        if threads <= 1:
+            return self.search(board, time_manager=time_manager)
+        self._ensure_smp_pool(threads)
+        self._smp_stop_event.clear()
+        # Los auxiliares se paran con el evento al terminar la búsqueda
+        # principal; el límite duro es solo una salvaguarda. Al ponderar no
+        # hay límite: el reloj no corre hasta ponderhit y el evento los para
+        # cuando termina la búsqueda principal (tras ponderhit o stop)
+        helper_limit = None if time_manager.pondering else time_manager.hard_limit
+
+        # La búsqueda principal avanzará la edad de la tabla a este valor
+        age = (self.tt.age + 1) % TranspositionTable.AGE_CYCLE
+        helpers = [
+            self._smp_pool.submit(_smp_search, board.copy(), self.max_depth + helper_id % 2,
+                                  helper_limit, helper_id, age)
+            for helper_id in range(1, threads)
+        ]
+
+        best_move, best_value = self.search(board, time_manager=time_manager)
+        best_depth = self.depth_completed
+        self._smp_stop_event.set()
+
+        for future in helpers:
+            move_uci, value, depth, nodes, evaluated = future.result()
+            self.search_info.nodes_searched += nodes
+            self.search_info.positions_evaluated += evaluated
+            if move_uci and depth > best_depth:
+                best_move, best_value, best_depth = chess.Move.from_uci(move_uci), value, depth
+        self.search_info.depth_reached = max(self.search_info.depth_reached, best_depth)
+        return best_move, best_value
+
+    def _ensure_smp_pool(self, threads: int):
+        """Crea (o redimensiona) el pool de auxiliares y la tabla compartida."""
+        options = self.search_options()
+        if (self._smp_pool is not None and self._smp_threads == threads
+                and self._smp_options == options):
+            return
+        self.close()
+        if not isinstance(self.tt, SharedTranspositionTable):
+            self.tt = SharedTranspositionTable.create(self.tt_size_mb, self.tt.ways)
+        context = multiprocessing.get_context(self.mp_start_method)
+        self._smp_stop_event = context.Event()
+        self._smp_pool = ProcessPoolExecutor(
+            max_workers=threads - 1,
+            mp_context=context,
+            initializer=_smp_init,
+            initargs=(self.evaluator, self.tt.name, self.tt.size_mb, self.tt.ways,
+                      self._smp_stop_event, options))
+        self._smp_threads = threads
+        self._smp_options = options
+
+    def search_parallel(self, board: chess.Board, workers: int = 4,
+                        time_limit: Optional[float] = None,
+                        time_manager: Optional[TimeManager] = None) -> Tuple[chess.Move, float]:
+        """Búsqueda con reparto de la raíz entre procesos.
+
+        En cada iteración el primer movimiento (PV) se busca en este proceso
+        para fijar alfa; el resto se reparte entre `workers` procesos con esa
+        cota. Cada proceso mantiene su propia tabla de transposición de
+        tt_size_mb entre tareas. Los procesos reciben lo que queda del límite
+        duro y un evento compartido: si se agota el tiempo o se pide parar,
+        abortan, se cancelan las tareas pendientes y se devuelve la última
+        iteración completa.
+        """
+        if time_manager is None:
+            time_manager = TimeManager.from_time_limit(time_limit, self.stop_event)
+        if workers <= 1:
+            return self.search(board, time_manager=time_manager)
+        self._ensure_split_pool(workers)
+        self._split_stop_event.clear()
+        self.time_manager = time_manager
+        self._start_tracking(board)
+        try:
+            return self._search_parallel(board)
+        finally:
+            self._stop_tracking()
+
+    def _search_parallel(self, board: chess.Board) -> Tuple[chess.Move, float]:
+        self.search_info = SearchInfo()
+        self.time_manager.start()
+        cache_counts = self._cache_counts()
+        self._aborted = False
+        self.tt.new_search()
+        root_ply = len(board.move_stack)
+        self._previous_pv = []
+        self.search_info.pv_line = []
+
+        best_move = None
+        best_value = float('-inf')
+        for current_depth in range(1, self.max_depth + 1):
+            self.search_info.depth_reached = current_depth
+            hash_key = self.hasher.key
+            tt_entry = self.tt.lookup(hash_key)
+            moves = self._order_moves(board, current_depth, tt_entry[3] if tt_entry else None,
+                                      self._previous_pv[0] if self._previous_pv else None)
+            if not moves:
+                break
+
+            # Movimiento PV en serie para establecer la cota
+            pv_move = moves[0]
+            if best_move is None:
+                best_move = pv_move
+            try:
+                self._follow_pv = bool(self._previous_pv) and pv_move == self._previous_pv[0]
+                self.hasher.push(pv_move)
+                alpha = -self._minimax(board, current_depth - 1, -self.INFINITY, self.INFINITY, 1)
+                self.hasher.pop()
+            except SearchAborted:
+                while len(board.move_stack) > root_ply:
+                    self.hasher.pop()
+                self._aborted = True
+                break
+            iteration_move, iteration_value = pv_move, alpha
+            iteration_pv = [pv_move] + self._pv_table[1]
+
+            # Resto de movimientos en paralelo con la ventana (alpha, +inf)
+            hard_limit = self.time_manager.hard_limit
+            remaining = None if hard_limit is None else max(0.0, hard_limit - self.time_manager.elapsed())
+            futures = [
+                self._split_pool.submit(_split_search, board.copy(), move.uci(), current_depth - 1,
+                                        alpha, remaining)
+                for move in moves[1:]
+            ]
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=0.01, return_when=FIRST_COMPLETED)
+                if pending and self.time_manager.hard_expired():
+                    # Los procesos en marcha abortan con el evento; los demás no llegan a empezar
+                    self._split_stop_event.set()
+                    for future in pending:
+                        future.cancel()
+                    wait(pending)
+                    self._aborted = True
+                    break
+            for future in futures:
+                if future.cancelled():
+                    continue
+                move_uci, value, nodes, evaluated, pv_uci = future.result()
+                self.search_info.nodes_searched += nodes
+                self.search_info.positions_evaluated += evaluated
+                if value is not None and value > iteration_value:
+                    iteration_move, iteration_value = chess.Move.from_uci(move_uci), value
+                    iteration_pv = [iteration_move] + [chess.Move.from_uci(uci) for uci in pv_uci]
+            if self._aborted:
+                break
+
+            best_move, best_value = iteration_move, iteration_value
+            self.tt.store(hash_key, self._value_to_tt(best_value, 0), current_depth,
+                          TranspositionTable.EXACT, best_move)
+            self._report_iteration(board, best_value, iteration_pv, current_depth)
+            if self.time_manager.soft_expired():
+                break
+
+        self.search_info.time_spent = self.time_manager.search_elapsed()
+        self._record_cache_counts(cache_counts)
         return best_move, best_value if board.turn else -best_value
 
-    def _minimax(self, board: chess.Board, depth: int, alpha: float, beta: float, maximizing: bool) -> float:
-        # Verificar finales
-        if board.is_game_over():
-            # Por esto:
-            if board.is_checkmate():
-                return -self.MATE_SCORE + depth  # Preferimos mates más cortos
+    def search_options(self) -> dict:
+        """Opciones del constructor que definen el algoritmo, para crear motores iguales en otros procesos."""
+        return dict(debug_hash=self.debug_hash, use_pvs=self.use_pvs,
+                    use_aspiration=self.use_aspiration, use_move_picker=self.use_move_picker,
+                    use_qsearch_pruning=self.use_qsearch_pruning,
+                    use_check_extensions=self.use_check_extensions,
+                    use_futility=self.use_futility, use_reverse_futility=self.use_reverse_futility,
+                    use_lmp=self.use_lmp, use_lmr_table=self.use_lmr_table)
+
+    def _ensure_split_pool(self, workers: int):
+        options = self.search_options()
+        if (self._split_pool is not None and self._split_workers == workers
+                and self._split_options == options):
+            return
+        if self._split_pool is not None:
+            self._split_pool.shutdown()
+        context = multiprocessing.get_context(self.mp_start_method)
+        self._split_stop_event = context.Event()
+        self._split_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_split_init,
+            initargs=(self.evaluator, self.tt_size_mb, self._split_stop_event, options))
+        self._split_workers = workers
+        self._split_options = options
+
+    def close(self):
+        """Detiene los procesos auxiliares y libera la memoria compartida."""
+        if self._split_pool is not None:
+            self._split_pool.shutdown()
+            self._split_pool = None
+            self._split_workers = 0
+        if self._smp_pool is not None:
+            self._smp_stop_event.set()
+            self._smp_pool.shutdown()
+            self._smp_pool = None
+            self._smp_threads = 0
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.close()
+            self.tt = TranspositionTable(self.tt_size_mb, self.tt.ways)
+
+    def _minimax(self, board: chess.Board, depth: int, alpha: float, beta: float, ply: int) -> float:
+        """Negamax con PVS: valor de la posición para el bando al turno."""
+        self.time_manager.tick()
+        self._pv_table[ply] = []
+        # ¿Seguimos sobre la PV anterior? Solo lo hereda el primer hijo
+        pv_move = None
+        if self._follow_pv and ply < len(self._previous_pv):
+            pv_move = self._previous_pv[ply]
+        self._follow_pv = False
+        # Tablas por repetición, regla de los 50 movimientos o material
+        # insuficiente; el mate y el ahogado se detectan al no haber movimientos
+        if self.hasher.is_repetition():
+            return self.DRAW_SCORE
+        if board.halfmove_clock >= 100 and not board.is_checkmate():
+            return self.DRAW_SCORE
+        if not (board.pawns | board.rooks | board.queens) and board.is_insufficient_material():
+            return self.DRAW_SCORE
+        
+        in_check = board.is_check()
+        if in_check and self.use_check_extensions:
+            depth += 1
             
         # Verificar tabla de transposición
-        hash_key = self.zobrist.compute_hash(board)
+        hash_key = self.hasher.key
         tt_entry = self.tt.lookup(hash_key)
         
         if tt_entry and tt_entry[1] >= depth:
-            value, stored_depth, flag, _ = tt_entry
+            _, stored_depth, flag, _ = tt_entry
+            value = self._value_from_tt(tt_entry[0], ply)
             if flag == TranspositionTable.EXACT:
                 return value
             elif flag == TranspositionTable.ALPHA and value <= alpha:
@@ -154,80 +684,122 @@ class MinimaxEngine:
             elif flag == TranspositionTable.BETA and value >= beta:
                 return beta
 
-        if depth == 0:
+        if depth <= 0 or ply >= self.MAX_PLY:
+            # La quiescencia no detecta el mate: solo hace falta mirarlo en jaque
+            if in_check and not any(board.generate_legal_moves()):
+                return -self.MATE_SCORE + ply
             return self._quiescence_search(board, alpha, beta)
 
+        # Poda cerca de las hojas, fuera de la PV, sin jaque y lejos del mate
+        pv_node = beta - alpha > 1
+        prunable = (not pv_node and not in_check
+                    and abs(alpha) < self.MATE_SCORE - self.MAX_PLY
+                    and abs(beta) < self.MATE_SCORE - self.MAX_PLY)
+        futile = False
+        if prunable and depth < len(self.FUTILITY_MARGINS):
+            static_eval = self._evaluate(board)
+            if (self.use_reverse_futility and depth <= self.REVERSE_FUTILITY_DEPTH
+                    and static_eval - self.REVERSE_FUTILITY_MARGIN * depth >= beta):
+                return beta
+            futile = self.use_futility and static_eval + self.FUTILITY_MARGINS[depth] <= alpha
+        late_move_limit = (self.LMP_COUNTS[depth] if self.use_lmp and prunable
+                           and depth < len(self.LMP_COUNTS) else None)
+
+        # Poda null move
+        if depth > 2 and not in_check:
+            R = 3 if depth > 6 else 2
+            self.hasher.push(chess.Move.null())
+            null_value = -self._minimax(board, depth - R - 1, -beta, -beta + 1, ply + 1)
+            self.hasher.pop()
+            if null_value >= beta:
+                return beta
+
         tt_move = tt_entry[3] if tt_entry else None
-        moves = self._order_moves(board, depth, tt_move)
-        best_value = float('-inf') if maximizing else float('inf')
+        if self.use_move_picker:
+            killers = tuple(self.killer_moves[depth]) if depth < len(self.killer_moves) else ()
+            picker = MovePicker(board, tt_move, pv_move, killers, self.history_table)
+            moves = picker
+        else:
+            picker = None
+            moves = self._order_moves(board, depth, tt_move, pv_move)
+        best_value = float('-inf')
         best_move = None
         original_alpha = alpha
-        
-        # Poda null move (aplicar en ambos lados)
-        if depth > 2 and not board.is_check():
-            R = 3 if depth > 6 else 2
-            board.push(chess.Move.null())
-            null_value = -self._minimax(board, depth - R - 1, -beta, -beta + 1, not maximizing)
-            board.pop()
-            if maximizing and null_value >= beta:
-                return beta
-            elif not maximizing and null_value <= alpha:
-                return alpha
 
+        quiets_searched = 0
+        moves_found = 0
         for i, move in enumerate(moves):
+            moves_found += 1
+            # El picker ya sabe si el movimiento es tranquilo
+            quiet = picker.quiet if picker else not board.is_capture(move) and not move.promotion
+            gives_check = quiet and i > 0 and board.gives_check(move)
+            if quiet and i > 0 and not gives_check:
+                if futile:
+                    continue
+                if late_move_limit is not None and quiets_searched >= late_move_limit:
+                    continue
+            if quiet:
+                quiets_searched += 1
+            
             # Late Move Reduction
             do_lmr = (i >= 4 and 
                      depth >= 3 and 
-                     not board.is_capture(move) and 
-                     not board.gives_check(move))
-            reduction = 1 if do_lmr else 0
+                     quiet and 
+                     not gives_check)
+            reduction = 0
+            if do_lmr:
+                if self.use_lmr_table:
+                    reduction = self._lmr_table[min(depth, 63)][min(i, 63)] - (1 if pv_node else 0)
+                    reduction = max(1, min(reduction, depth - 2))
+                else:
+                    reduction = 1
                 
-            board.push(move)
+            self.hasher.push(move)
             self.search_info.nodes_searched += 1
+            self._follow_pv = pv_move is not None and move == pv_move
             
-            value = -self._minimax(
-                board, 
-                depth - 1 - reduction,
-                -beta,
-                -alpha,
-                not maximizing
-            )
-            
-            # Re-búsqueda si LMR falló alto
-            if reduction and ((maximizing and value > alpha) or (not maximizing and value < beta)):
-                value = -self._minimax(board, depth - 1, -beta, -alpha, not maximizing)
+            if i == 0:
+                value = -self._minimax(board, depth - 1, -beta, -alpha, ply + 1)
+            elif self.use_pvs:
+                # Ventana nula: solo comprobamos si el movimiento mejora alfa
+                value = -self._minimax(board, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+                if reduction and value > alpha:
+                    value = -self._minimax(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < value < beta:
+                    value = -self._minimax(board, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                value = -self._minimax(board, depth - 1 - reduction, -beta, -alpha, ply + 1)
+                # Re-búsqueda si LMR falló alto
+                if reduction and value > alpha:
+                    value = -self._minimax(board, depth - 1, -beta, -alpha, ply + 1)
                 
-            board.pop()
+            self.hasher.pop()
             
-            if maximizing:
-                if value > best_value:
-                    best_value = value
-                    best_move = move
-                    if not board.is_capture(move) and depth < len(self.killer_moves):
-                        self.killer_moves[depth][1] = self.killer_moves[depth][0]
-                        self.killer_moves[depth][0] = move
-                alpha = max(alpha, value)
-            else:
-                if value < best_value:
-                    best_value = value
-                    best_move = move
-                    if not board.is_capture(move) and depth < len(self.killer_moves):
-                        self.killer_moves[depth][1] = self.killer_moves[depth][0]
-                        self.killer_moves[depth][0] = move
-                beta = min(beta, value)
+            if value > best_value:
+                best_value = value
+                best_move = move
+                if value > alpha:
+                    alpha = value
+                    self._pv_table[ply] = [move] + self._pv_table[ply + 1]
                 
-            if beta <= alpha:
+            if alpha >= beta:
                 if not board.is_capture(move):
+                    if depth < len(self.killer_moves) and self.killer_moves[depth][0] != move:
+                        self.killer_moves[depth][1] = self.killer_moves[depth][0]
+                        self.killer_moves[depth][0] = move
                     move_key = (board.piece_at(move.from_square), move.to_square)
                     self.history_table[move_key] = self.history_table.get(move_key, 0) + depth * depth
                 break
 
+        if not moves_found:
+            return -self.MATE_SCORE + ply if in_check else self.DRAW_SCORE  # Preferimos mates más cortos
+
         # Almacenar en tabla de transposición
-        if best_move:  # Solo almacenar si encontramos un mejor movimiento
-            flag = (TranspositionTable.EXACT if alpha > original_alpha and beta > best_value
-                  else TranspositionTable.BETA if beta <= best_value
-                  else TranspositionTable.ALPHA)
-            self.tt.store(hash_key, best_value, depth, flag, best_move)
+        if best_move:
+            flag = (TranspositionTable.ALPHA if best_value <= original_alpha
+                    else TranspositionTable.BETA if best_value >= beta
+                    else TranspositionTable.EXACT)
+            self.tt.store(hash_key, self._value_to_tt(best_value, ply), depth, flag, best_move)
 
         return best_value
         
@@ -236,38 +808,98 @@ class MinimaxEngine:
         
     def _quiescence_search(self, board: chess.Board, alpha: float, beta: float) -> float:
         self.search_info.positions_evaluated += 1
+        self.time_manager.tick()
         
-        # En negamax, no multiplicamos por turno
-        # Por esto:
-        stand_pat = self.evaluator.evaluate(board) * (1 if board.turn else -1)
-        
-        # El resto del código se mantiene igual
+        # El evaluador ya puntúa desde el bando al turno
+        stand_pat = self._evaluate(board)
         
         if stand_pat >= beta:
             return beta
         
         alpha = max(alpha, stand_pat)
         
-        # Ordenar capturas por MVV-LVA
-        captures = []
-        for move in board.legal_moves:
-            if board.is_capture(move) or move.promotion == chess.QUEEN:
-                victim = board.piece_at(move.to_square)
-                attacker = board.piece_at(move.from_square)
-                if victim and attacker:
-                    score = victim.piece_type * 10 - attacker.piece_type
-                    captures.append((move, score))
-        
-        # Ordenar capturas por score
-        captures.sort(key=lambda x: x[1], reverse=True)
+        # Capturas y promociones a dama, ordenadas por MVV-LVA
+        captures = list(board.generate_legal_captures())
+        pawns = board.pawns & board.occupied_co[board.turn]
+        captures.extend(move for move in board.generate_legal_moves(pawns, PROMOTION_RANKS & ~board.occupied)
+                        if move.promotion == chess.QUEEN)
+        captures.sort(key=lambda move: mvv_lva(board, move), reverse=True)
         
-        for move, _ in captures:
-            board.push(move)
+        for move in captures:
+            if self.use_qsearch_pruning and move.promotion is None:
+                # Delta pruning: ni ganando la pieza se llegaría a alfa
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                if stand_pat + SEE_VALUES[victim] + self.DELTA_MARGIN <= alpha:
+                    continue
+                if losing_capture(board, move):
+                    continue
+            self.hasher.push(move)
             score = -self._quiescence_search(board, -beta, -alpha)
-            board.pop()
+            self.hasher.pop()
             
             if score >= beta:
                 return beta
             alpha = max(alpha, score)
                     
         return alpha
+
+
+# Motor de cada proceso auxiliar de Lazy SMP (uno por proceso)
+_smp_engine: Optional[MinimaxEngine] = None
+
+def _smp_init(evaluator, tt_name: str, tt_size_mb: int, tt_ways: int, stop_event, options: dict):
+    global _smp_engine
+    tt = SharedTranspositionTable.attach(tt_name, tt_size_mb, tt_ways)
+    # Mismo algoritmo que el motor principal (opciones use_* de search_options)
+    _smp_engine = MinimaxEngine(evaluator, tt_size_mb=tt_size_mb, tt=tt, **options)
+    _smp_engine.stop_event = stop_event
+
+def _smp_search(board: chess.Board, depth: int, time_limit: Optional[float],
+                helper_id: int, age: int):
+    """Búsqueda de un auxiliar; devuelve (movimiento uci, valor, profundidad completa, nodos, evaluaciones)."""
+    engine = _smp_engine
+    engine.max_depth = depth
+    engine.helper_id = helper_id
+    engine.tt.age = age
+    move, value = engine.search(board, time_limit)
+    info = engine.search_info
+    return (move.uci() if move else None, value, engine.depth_completed,
+            info.nodes_searched, info.positions_evaluated)
+
+
+# Motor de cada proceso de search_parallel (uno por proceso)
+_split_engine: Optional[MinimaxEngine] = None
+
+def _split_init(evaluator, tt_size_mb: int, stop_event, options: dict):
+    global _split_engine
+    _split_engine = MinimaxEngine(evaluator, tt_size_mb=tt_size_mb, **options)
+    _split_engine.stop_event = stop_event
+
+def _split_search(board: chess.Board, move_uci: str, depth: int, alpha: float,
+                  hard_limit: Optional[float] = None):
+    """Busca un movimiento de la raíz; devuelve (movimiento uci, valor, nodos, evaluaciones, PV tras el movimiento).
+
+    Si se agota hard_limit o se activa el evento de parada, el valor es None.
+    """
+    engine = _split_engine
+    engine.search_info = SearchInfo()
+    engine.time_manager = TimeManager(hard_limit=hard_limit, stop_event=engine.stop_event)
+    engine.time_manager.start()
+    engine._start_tracking(board)
+    try:
+        engine.hasher.push(chess.Move.from_uci(move_uci))
+        if engine.use_pvs:
+            # Ventana nula primero; solo se repite si supera la cota del PV
+            value = -engine._minimax(board, depth, -alpha - 1, -alpha, 1)
+            if value > alpha:
+                value = -engine._minimax(board, depth, -engine.INFINITY, -alpha, 1)
+        else:
+            value = -engine._minimax(board, depth, -engine.INFINITY, -alpha, 1)
+    except SearchAborted:
+        info = engine.search_info
+        return move_uci, None, info.nodes_searched, info.positions_evaluated, []
+    finally:
+        engine._stop_tracking()
+    info = engine.search_info
+    pv_uci = [move.uci() for move in engine._pv_table[1]]
+    return move_uci, value, info.nodes_searched, info.positions_evaluated, pv_uci
@@ -1,5 +1,182 @@
 import chess
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
-def order_moves(board: chess.Board, moves):
-    # Implementar ordenamiento de movimientos
-    pass
+# Etapas del MovePicker, en el orden en que se recorren
+HASH, CAPTURES, KILLERS, QUIETS, BAD_CAPTURES = range(5)
+
+PROMOTION_RANKS = chess.BB_RANK_1 | chess.BB_RANK_8
+
+# Valores de las piezas para el intercambio estático (índice = piece_type)
+SEE_VALUES = (0, 100, 325, 335, 500, 975, 20000)
+
+
+def attackers_to(board: chess.Board, square: chess.Square, occupied: int) -> int:
+    """Piezas de ambos bandos que atacan `square` con la ocupación `occupied`."""
+    queens_rooks = board.queens | board.rooks
+    queens_bishops = board.queens | board.bishops
+    attackers = (
+        (chess.BB_KING_ATTACKS[square] & board.kings)
+        | (chess.BB_KNIGHT_ATTACKS[square] & board.knights)
+        | (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] & queens_rooks)
+        | (chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied] & queens_rooks)
+        | (chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied] & queens_bishops)
+        | (chess.BB_PAWN_ATTACKS[chess.WHITE][square] & board.pawns & board.occupied_co[chess.BLACK])
+        | (chess.BB_PAWN_ATTACKS[chess.BLACK][square] & board.pawns & board.occupied_co[chess.WHITE]))
+    return attackers & occupied
+
+
+def see(board: chess.Board, move: chess.Move) -> int:
+    """Intercambio estático: balance material de la secuencia de capturas en la
+    casilla de destino, respondiendo siempre con la pieza menos valiosa.
+
+    Las piezas que se retiran de la ocupación descubren los ataques en rayos X
+    de las que estaban detrás. No tiene en cuenta clavadas ni jaques.
+    """
+    from_square, to_square = move.from_square, move.to_square
+    occupied = board.occupied ^ chess.BB_SQUARES[from_square]
+    if board.is_en_passant(move):
+        victim = chess.PAWN
+        occupied ^= chess.BB_SQUARES[to_square - 8 if board.turn == chess.WHITE else to_square + 8]
+    else:
+        victim = board.piece_type_at(to_square)
+    on_square = board.piece_type_at(from_square)
+    gain = [SEE_VALUES[victim] if victim else 0]
+    if move.promotion:
+        gain[0] += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+        on_square = move.promotion
+
+    color = not board.turn
+    attackers = attackers_to(board, to_square, occupied)
+    while True:
+        side_attackers = attackers & board.occupied_co[color]
+        if not side_attackers:
+            break
+        for piece_type in chess.PIECE_TYPES:
+            candidates = side_attackers & board.pieces_mask(piece_type, color)
+            if candidates:
+                break
+        if piece_type == chess.KING and attackers & board.occupied_co[not color]:
+            # El rey no puede capturar en una casilla defendida
+            break
+        gain.append(SEE_VALUES[on_square] - gain[-1])
+        on_square = piece_type
+        occupied ^= candidates & -candidates
+        attackers = attackers_to(board, to_square, occupied)
+        color = not color
+
+    # Cada bando puede dejar de capturar si le conviene
+    while len(gain) > 1:
+        value = gain.pop()
+        gain[-1] = -max(-gain[-1], value)
+    return gain[0]
+
+
+def losing_capture(board: chess.Board, move: chess.Move) -> bool:
+    """True si la captura pierde material según el intercambio estático."""
+    victim = board.piece_type_at(move.to_square) or chess.PAWN
+    # Capturar una pieza de igual o más valor nunca pierde: no hace falta SEE
+    if not move.promotion and SEE_VALUES[victim] >= SEE_VALUES[board.piece_type_at(move.from_square)]:
+        return False
+    return see(board, move) < 0
+
+
+def mvv_lva(board: chess.Board, move: chess.Move) -> int:
+    """Víctima más valiosa / atacante menos valioso; las promociones a dama primero."""
+    attacker = board.piece_type_at(move.from_square)
+    victim = board.piece_type_at(move.to_square)
+    if victim is None and board.is_en_passant(move):
+        victim = chess.PAWN
+    score = (victim or 0) * 10 - (attacker or 0)
+    if move.promotion == chess.QUEEN:
+        score += 100
+    return score
+
+
+class MovePicker:
+    """Generador por etapas de los movimientos legales de un nodo.
+
+    Orden: movimiento de la PV y de la TT (validados con is_legal, sin
+    generar nada), capturas y promociones por MVV-LVA, killers, el resto
+    de movimientos por historia y al final las capturas que pierden
+    material según el intercambio estático (SEE). Cada etapa se genera y se puntúa solo
+    cuando la anterior se agota, así que si el primer movimiento produce un
+    corte no se llega a generar el resto. `stage` indica la etapa del
+    último movimiento entregado.
+    """
+    def __init__(self, board: chess.Board, tt_move: Optional[chess.Move] = None,
+                 pv_move: Optional[chess.Move] = None, killers: Sequence[Optional[chess.Move]] = (),
+                 history: Optional[Dict[Tuple[chess.Piece, int], int]] = None):
+        self.board = board
+        self.tt_move = tt_move
+        self.pv_move = pv_move
+        self.killers = killers
+        self.history = history if history is not None else {}
+        self.stage = HASH
+
+    def __iter__(self) -> Iterator[chess.Move]:
+        board = self.board
+        # Movimientos ya entregados en las etapas de hash y killers
+        seen: List[chess.Move] = []
+
+        self.stage = HASH
+        for move in (self.pv_move, self.tt_move):
+            if move and move not in seen and board.is_legal(move):
+                seen.append(move)
+                yield move
+
+        self.stage = CAPTURES
+        bad_captures = []
+        for move in self._tactical_moves(seen):
+            if losing_capture(board, move):
+                bad_captures.append(move)
+            else:
+                yield move
+
+        self.stage = KILLERS
+        for move in self.killers:
+            if (move and move not in seen and not move.promotion
+                    and not board.is_capture(move) and board.is_legal(move)):
+                seen.append(move)
+                yield move
+
+        self.stage = QUIETS
+        for move in self._quiet_moves(seen):
+            yield move
+
+        self.stage = BAD_CAPTURES
+        for move in bad_captures:
+            yield move
+
+    @property
+    def quiet(self) -> bool:
+        """True si el último movimiento entregado es un killer o un movimiento tranquilo."""
+        return self.stage == KILLERS or self.stage == QUIETS
+
+    def _tactical_moves(self, seen: List[chess.Move]) -> List[chess.Move]:
+        """Capturas y promociones ordenadas por MVV-LVA."""
+        board = self.board
+        scored = [(mvv_lva(board, move), move) for move in board.generate_legal_captures()
+                  if move not in seen]
+        # Promociones sin captura (las que capturan ya salen arriba)
+        pawns = board.pawns & board.occupied_co[board.turn]
+        for move in board.generate_legal_moves(pawns, PROMOTION_RANKS & ~board.occupied):
+            if move not in seen:
+                scored.append((mvv_lva(board, move), move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def _quiet_moves(self, seen: List[chess.Move]) -> List[chess.Move]:
+        """Movimientos sin captura ni promoción, ordenados por historia."""
+        board = self.board
+        history = self.history
+        ep_square = board.ep_square
+        scored = []
+        for move in board.generate_legal_moves(chess.BB_ALL, ~board.occupied_co[not board.turn]):
+            if move.promotion or move in seen:
+                continue
+            if move.to_square == ep_square and board.is_en_passant(move):
+                continue
+            score = history.get((board.piece_at(move.from_square), move.to_square), 0)
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
@@ -0,0 +1,142 @@
+"""Libro de aperturas local en formato Polyglot.
+
+build_book recorre partidas PGN y escribe un libro binario ordenado por
+clave: entradas de 16 bytes (clave Zobrist Polyglot, movimiento, peso y un
+campo de aprendizaje sin usar), compatible con cualquier programa que lea
+libros Polyglot. OpeningBook lo abre mapeado en memoria y busca la posición
+con búsqueda binaria, sin leer el fichero entero ni consultar la red.
+
+Uso:
+    python opening_book.py partidas.pgn [otras.pgn ...] -o book.bin --max-ply 20
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+# Clave (8), movimiento (2), peso (2), aprendizaje (4), en big-endian
+ENTRY_STRUCT = struct.Struct('>QHHI')
+MAX_WEIGHT = 0xFFFF
+
+PROMOTION_CODES = {chess.KNIGHT: 1, chess.BISHOP: 2, chess.ROOK: 3, chess.QUEEN: 4}
+
+
+def encode_move(board: chess.Board, move: chess.Move) -> int:
+    """Movimiento en la codificación Polyglot (el enroque es rey captura torre)."""
+    to_square = move.to_square
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        to_square = chess.square(7 if board.is_kingside_castling(move) else 0, rank)
+    return (chess.square_file(to_square)
+            | chess.square_rank(to_square) << 3
+            | chess.square_file(move.from_square) << 6
+            | chess.square_rank(move.from_square) << 9
+            | PROMOTION_CODES.get(move.promotion, 0) << 12)
+
+
+def result_points(result: str, turn: chess.Color) -> int:
+    """Peso de una jugada según el resultado para quien la hace: 2 victoria, 1 tablas."""
+    if result == '1/2-1/2':
+        return 1
+    if result == '1-0':
+        return 2 if turn == chess.WHITE else 0
+    if result == '0-1':
+        return 2 if turn == chess.BLACK else 0
+    # Partidas sin resultado: cuentan como tablas
+    return 1
+
+
+def collect_moves(pgn_paths: Iterable[str], max_ply: int = 20) -> Dict[Tuple[int, int], int]:
+    """Suma los pesos de cada (clave, movimiento) en los primeros max_ply plies de las partidas."""
+    weights: Dict[Tuple[int, int], int] = defaultdict(int)
+    for path in pgn_paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            while True:
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                if game.headers.get('Variant', 'Standard').lower() not in ('standard', 'chess'):
+                    continue
+                result = game.headers.get('Result', '*')
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    if ply >= max_ply:
+                        break
+                    points = result_points(result, board.turn)
+                    if points:
+                        weights[(chess.polyglot.zobrist_hash(board), encode_move(board, move))] += points
+                    board.push(move)
+    return weights
+
+
+def build_book(pgn_paths: Iterable[str], output_path: str, max_ply: int = 20, min_weight: int = 1) -> int:
+    """Escribe el libro Polyglot de las partidas; devuelve el número de entradas."""
+    weights = collect_moves(pgn_paths, max_ply)
+    entries = [(key, move, weight) for (key, move), weight in weights.items() if weight >= min_weight]
+    # Los pesos se escalan para caber en 16 bits sin perder las proporciones
+    top = max((weight for _, _, weight in entries), default=0)
+    scale = MAX_WEIGHT / top if top > MAX_WEIGHT else 1
+    # Ordenado por clave y, dentro de cada posición, de más a menos peso
+    entries.sort(key=lambda entry: (entry[0], -entry[2]))
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'wb') as f:
+        for key, move, weight in entries:
+            f.write(ENTRY_STRUCT.pack(key, move, max(1, int(weight * scale)), 0))
+    return len(entries)
+
+
+class OpeningBook:
+    """Libro Polyglot mapeado en memoria.
+
+    get_move devuelve (movimiento, información) o (None, None) si la
+    posición no está en el libro o el fichero no existe.
+    """
+    def __init__(self, path: str, rng: Optional[random.Random] = None):
+        self.path = path
+        self.rng = rng or random.Random()
+        self._reader = chess.polyglot.open_reader(path) if os.path.exists(path) else None
+
+    def get_move(self, board: chess.Board) -> Tuple[Optional[chess.Move], Optional[str]]:
+        """Elige un movimiento del libro al azar, con probabilidad proporcional al peso."""
+        if self._reader is None:
+            return None, None
+        # Con el tablero, el lector convierte los enroques y descarta lo ilegal
+        entries = list(self._reader.find_all(board))
+        if not entries:
+            return None, None
+        total = sum(item.weight for item in entries)
+        if total:
+            entry = self.rng.choices(entries, weights=[item.weight for item in entries])[0]
+        else:
+            # Libro sin pesos: todas las jugadas valen lo mismo
+            entry = self.rng.choice(entries)
+        share = entry.weight * 100 // total if total else 100 // len(entries)
+        return entry.move, f"Libro: {len(entries)} jugadas, {share}% de peso"
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye un libro de aperturas Polyglot a partir de PGN")
+    parser.add_argument('pgn', nargs='+', help="Ficheros PGN de entrada")
+    parser.add_argument('-o', '--output', default='book.bin', help="Libro de salida")
+    parser.add_argument('--max-ply', type=int, default=20, help="Plies de cada partida que entran en el libro")
+    parser.add_argument('--min-weight', type=int, default=1, help="Peso mínimo de una jugada para incluirla")
+    args = parser.parse_args()
+
+    count = build_book(args.pgn, args.output, args.max_ply, args.min_weight)
+    print(f"{count} entradas escritas en {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
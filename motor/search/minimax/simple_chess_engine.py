@@ -1,7 +1,9 @@
 import chess
-from typing import Tuple, Optional, List
+from typing import Callable, Tuple, Optional, List
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from .time_manager import TimeManager, SearchAborted
 
 class MaterialEvaluator:
     def __init__(self):
@@ -34,6 +36,8 @@ class SearchInfo:
     positions_evaluated: int = 0
     time_spent: float = 0.0
     depth_reached: int = 0
+    pv_line: List[chess.Move] = field(default_factory=list)
+    score: float = 0.0
 
 class MinimaxEngine:
     def __init__(self, evaluator, depth=3):
@@ -41,6 +45,12 @@ class MinimaxEngine:
         self.max_depth = depth
         self.search_info = SearchInfo()
         self.debug_mode = True
+        self.time_manager = TimeManager()
+        # Se llama con search_info tras cada iteración completa
+        self.info_callback: Optional[Callable[[SearchInfo], None]] = None
+        # Variante principal por distancia a la raíz (tabla triangular)
+        self._pv = {}
+        self._root_ply = 0
         
     def _order_moves(self, board: chess.Board) -> List[chess.Move]:
         """Ordenamiento mejorado de movimientos para poda alfa-beta más eficiente"""
@@ -74,35 +84,57 @@ class MinimaxEngine:
         # Ordenar movimientos por puntuación
         return [move for move, _ in sorted(move_scores, key=lambda x: x[1], reverse=True)]
         
-    def search(self, board: chess.Board) -> Tuple[Optional[chess.Move], float]:
+    def search(self, board: chess.Board, time_limit: Optional[float] = None,
+               time_manager: Optional[TimeManager] = None) -> Tuple[Optional[chess.Move], float]:
+        """Busca hasta max_depth; con límite de tiempo (o si se puede detener con
+        stop_event) profundiza iterativamente y, si se agota, devuelve la última
+        iteración completa."""
+        if time_manager is None:
+            time_manager = TimeManager.from_time_limit(time_limit)
+        self.time_manager = time_manager
         self.search_info = SearchInfo()
+        time_manager.start()
         start_time = time.time()
         
         best_move = None
         best_value = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
+        move_evaluations = []
         
         # Usar el nuevo ordenamiento de movimientos
-        move_evaluations = []
         moves = self._order_moves(board)
+        if moves:
+            best_move = moves[0]
+        root_ply = len(board.move_stack)
+        self._root_ply = root_ply
+        interruptible = (time_manager.soft_limit is not None or time_manager.hard_limit is not None
+                         or time_manager.stop_event is not None)
+        first_depth = 1 if interruptible else self.max_depth
         
-        for move in moves:
-            board.push(move)
-            self.search_info.nodes_searched += 1
-            value = -self._alpha_beta(board, self.max_depth - 1, -beta, -alpha, False)
-            board.pop()
-            
-            move_evaluations.append((move, value))
+        for depth in range(first_depth, self.max_depth + 1):
+            try:
+                iteration = self._search_root(board, moves, depth)
+            except SearchAborted:
+                while len(board.move_stack) > root_ply:
+                    board.pop()
+                break
             
-            if value > best_value:
-                best_value = value
-                best_move = move
-                alpha = value
+            move_evaluations = [(move, value) for move, value, _ in iteration]
+            if iteration:
+                best_move, best_value, self.search_info.pv_line = max(iteration, key=lambda x: x[1])
+            self.search_info.depth_reached = depth
+            self.search_info.score = best_value
+            self.search_info.time_spent = time.time() - start_time
+            if self.info_callback is not None:
+                self.info_callback(self.search_info)
+            # La siguiente iteración empieza por los mejores de esta
+            moves = [move for move, _ in sorted(move_evaluations, key=lambda x: x[1], reverse=True)]
+            if time_manager.soft_expired():
+                break
+        self.search_info.time_spent = time.time() - start_time
         
         if self.debug_mode:
             print("\n=== Análisis de movimientos ===")
-            print(f"Profundidad de búsqueda: {self.max_depth}")
+            print(f"Profundidad de búsqueda: {self.search_info.depth_reached}")
             print("\nMejores movimientos encontrados:")
             print("-" * 40)
             print(f"{'Movimiento':<10} {'Evaluación':>10} {'Capturas':^10}")
@@ -123,7 +155,26 @@ class MinimaxEngine:
         
         return best_move, best_value
         
+    def _search_root(self, board: chess.Board, moves: List[chess.Move],
+                     depth: int) -> List[Tuple[chess.Move, float, List[chess.Move]]]:
+        """Una iteración a profundidad fija; devuelve (movimiento, valor, variante) de cada movimiento."""
+        alpha = float('-inf')
+        beta = float('inf')
+        move_evaluations = []
+        for move in moves:
+            board.push(move)
+            self.search_info.nodes_searched += 1
+            value = -self._alpha_beta(board, depth - 1, -beta, -alpha, False)
+            board.pop()
+            
+            move_evaluations.append((move, value, [move] + self._pv.get(1, [])))
+            alpha = max(alpha, value)
+        return move_evaluations
+        
     def _alpha_beta(self, board: chess.Board, depth: int, alpha: float, beta: float, maximizing: bool) -> float:
+        self.time_manager.tick()
+        ply = len(board.move_stack) - self._root_ply
+        self._pv[ply] = []
         if depth == 0 or board.is_game_over():
             self.search_info.positions_evaluated += 1
             return self.evaluator.evaluate(board)
@@ -135,8 +186,11 @@ class MinimaxEngine:
             for move in moves:
                 board.push(move)
                 self.search_info.nodes_searched += 1
-                value = max(value, -self._alpha_beta(board, depth - 1, -beta, -alpha, False))
+                child_value = -self._alpha_beta(board, depth - 1, -beta, -alpha, False)
                 board.pop()
+                if child_value > value:
+                    value = child_value
+                    self._pv[ply] = [move] + self._pv.get(ply + 1, [])
                 
                 alpha = max(alpha, value)
                 if beta <= alpha:
@@ -147,8 +201,11 @@ class MinimaxEngine:
             for move in moves:
                 board.push(move)
                 self.search_info.nodes_searched += 1
-                value = min(value, -self._alpha_beta(board, depth - 1, -beta, -alpha, True))
+                child_value = -self._alpha_beta(board, depth - 1, -beta, -alpha, True)
                 board.pop()
+                if child_value < value:
+                    value = child_value
+                    self._pv[ply] = [move] + self._pv.get(ply + 1, [])
                 
                 beta = min(beta, value)
                 if beta <= alpha:
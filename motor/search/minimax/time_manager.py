@@ -0,0 +1,105 @@
+import time
+from typing import Optional
+
+import chess
+
+
+class SearchAborted(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el límite duro o se pide parar."""
+
+
+class TimeManager:
+    """Presupuesto de tiempo de una búsqueda.
+
+    soft_limit: no se empieza otra iteración de la profundización iterativa
+    si ya se ha consumido. hard_limit: la búsqueda se aborta en cuanto se
+    supera, comprobando el reloj cada check_interval nodos desde tick().
+    Ambos en segundos desde start(); None significa sin límite.
+
+    Con pondering=True (búsqueda durante el turno del rival) los límites no
+    cuentan hasta ponderhit(), que arranca el reloj en ese momento.
+    """
+    def __init__(self, soft_limit: Optional[float] = None, hard_limit: Optional[float] = None,
+                 check_interval: int = 256, stop_event=None):
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.check_interval = check_interval
+        self.stop_event = stop_event
+        self.start_time = time.time()
+        # Inicio real de la búsqueda (ponderhit no lo mueve): para informar de time/nps
+        self.search_start_time = self.start_time
+        self.nodes = 0
+        self.pondering = False
+
+    @classmethod
+    def from_time_limit(cls, time_limit: Optional[float], stop_event=None) -> 'TimeManager':
+        """Límite fijo por jugada: time_limit es el tope duro y la mitad el blando
+        (una iteración suele costar más que todas las anteriores juntas)."""
+        if not time_limit:
+            return cls(stop_event=stop_event)
+        return cls(time_limit * 0.5, time_limit, stop_event=stop_event)
+
+    @classmethod
+    def from_clock(cls, turn: chess.Color, wtime: Optional[float] = None, btime: Optional[float] = None,
+                   winc: float = 0, binc: float = 0, movestogo: Optional[int] = None,
+                   movetime: Optional[float] = None, move_overhead: float = 0.05,
+                   stop_event=None) -> 'TimeManager':
+        """Presupuesto a partir del reloj (segundos), como los parámetros de `go` en UCI."""
+        if movetime is not None:
+            limit = max(0.01, movetime - move_overhead)
+            return cls(limit, limit, stop_event=stop_event)
+
+        remaining = wtime if turn == chess.WHITE else btime
+        if remaining is None:
+            return cls(stop_event=stop_event)
+        increment = winc if turn == chess.WHITE else binc
+        remaining = max(0.01, remaining - move_overhead)
+
+        # Sin movestogo suponemos que quedan unas 30 jugadas
+        moves_left = min(movestogo, 50) if movestogo else 30
+        budget = remaining / moves_left + increment * 0.75
+        soft_limit = min(budget, remaining * 0.4)
+        hard_limit = min(soft_limit * 4, remaining * 0.8)
+        return cls(soft_limit, max(soft_limit, hard_limit), stop_event=stop_event)
+
+    def start(self):
+        self.start_time = time.time()
+        self.search_start_time = self.start_time
+        self.nodes = 0
+
+    def ponderhit(self):
+        """El rival jugó la respuesta esperada: la búsqueda pasa a ser normal."""
+        self.start_time = time.time()
+        self.pondering = False
+
+    def elapsed(self) -> float:
+        """Tiempo consumido del presupuesto (desde ponderhit si se estaba ponderando)."""
+        return time.time() - self.start_time
+
+    def search_elapsed(self) -> float:
+        """Tiempo desde el inicio de la búsqueda, incluida la fase de ponder."""
+        return time.time() - self.search_start_time
+
+    def stop_requested(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def soft_expired(self) -> bool:
+        """True si no conviene empezar otra iteración."""
+        if self.stop_requested():
+            return True
+        if self.pondering:
+            return False
+        return self.soft_limit is not None and self.elapsed() >= self.soft_limit
+
+    def hard_expired(self) -> bool:
+        if self.stop_requested():
+            return True
+        if self.pondering:
+            return False
+        return self.hard_limit is not None and self.elapsed() >= self.hard_limit
+
+    def tick(self):
+        """Cuenta un nodo; cada check_interval nodos mira el reloj y aborta si hace falta."""
+        self.nodes += 1
+        if self.nodes % self.check_interval == 0 and self.hard_expired():
+            raise SearchAborted()
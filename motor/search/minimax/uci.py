@@ -0,0 +1,247 @@
+"""Interfaz UCI para MinimaxEngine.
+
+Lee comandos UCI por la entrada estándar y responde por la salida estándar,
+de modo que el motor se puede usar desde cualquier GUI o gestor de torneos
+compatible (cutechess-cli, Arena, ...). La búsqueda se ejecuta en un hilo
+aparte: `stop` e `isready` se atienden al momento y cada iteración completa
+se publica como una línea `info`.
+
+Con la opción Ponder, `bestmove` propone la respuesta esperada (segundo
+movimiento de la PV) y `go ponder` la busca durante el turno del rival;
+`ponderhit` la convierte en una búsqueda normal con el presupuesto de
+reloj recibido, sin perder lo ya calculado.
+
+Uso:
+    python uci.py
+"""
+import os
+import sys
+import threading
+from typing import List, Optional
+
+import chess
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from minimaxengine import MinimaxEngine, SearchInfo
+from evaluator.material import MaterialEvaluator
+from minimax.zobrist_hash import TranspositionTable
+from minimax.time_manager import TimeManager
+
+ENGINE_NAME = "Minimax Python"
+ENGINE_AUTHOR = "chess_bot"
+
+DEFAULT_HASH_MB = 32
+MAX_HASH_MB = 1024
+MAX_THREADS = 16
+# Profundidad máxima cuando el límite es solo el tiempo (o `go infinite`)
+MAX_SEARCH_DEPTH = 64
+
+
+class UCIEngine:
+    """Estado de la sesión UCI: posición actual, opciones y búsqueda en curso."""
+    def __init__(self, output=None):
+        self.output = output or sys.stdout
+        self.engine = MinimaxEngine(MaterialEvaluator(), depth=MAX_SEARCH_DEPTH,
+                                    tt_size_mb=DEFAULT_HASH_MB)
+        self.engine.info_callback = self._send_info
+        # Los auxiliares de Threads > 1 se crean desde el hilo de búsqueda
+        # mientras el principal lee stdin: con 'fork' se bloquearían
+        self.engine.mp_start_method = 'spawn'
+        self.board = chess.Board()
+        self.threads = 1
+        self._search_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # Presupuesto de la búsqueda en curso (ponderhit lo activa)
+        self._time_manager: Optional[TimeManager] = None
+        self._ponderhit_event = threading.Event()
+        self._output_lock = threading.Lock()
+
+    def send(self, line: str):
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self, input_stream=None):
+        """Bucle principal: procesa comandos hasta `quit` o fin de la entrada."""
+        input_stream = input_stream or sys.stdin
+        for line in input_stream:
+            if not self.handle(line):
+                break
+        self.stop_search()
+        self.engine.close()
+
+    def handle(self, line: str) -> bool:
+        """Procesa una línea; devuelve False si hay que terminar."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}")
+            self.send(f"option name Threads type spin default 1 min 1 max {MAX_THREADS}")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'ucinewgame':
+            self.stop_search()
+            self.engine.new_game()
+        elif command == 'setoption':
+            self.stop_search()
+            self._set_option(args)
+        elif command == 'position':
+            self.stop_search()
+            self._set_position(args)
+        elif command == 'go':
+            self.stop_search()
+            self._go(args)
+        elif command == 'ponderhit':
+            if self._time_manager is not None:
+                self._time_manager.ponderhit()
+            self._ponderhit_event.set()
+        elif command == 'stop':
+            self.stop_search()
+        elif command == 'quit':
+            return False
+        return True
+
+    def _set_option(self, args: List[str]):
+        """setoption name <nombre> value <valor>"""
+        if 'name' not in args:
+            return
+        value_index = args.index('value') if 'value' in args else len(args)
+        name = ' '.join(args[args.index('name') + 1:value_index]).lower()
+        value = ' '.join(args[value_index + 1:])
+        try:
+            if name == 'hash':
+                size_mb = max(1, min(MAX_HASH_MB, int(value)))
+                # Los pools de procesos comparten la tabla anterior: se cierran
+                self.engine.close()
+                self.engine.tt_size_mb = size_mb
+                self.engine.tt = TranspositionTable(size_mb)
+            elif name == 'threads':
+                self.threads = max(1, min(MAX_THREADS, int(value)))
+        except ValueError:
+            self.send(f"info string valor no válido para {name}: {value}")
+
+    def _set_position(self, args: List[str]):
+        """position [startpos | fen <fen>] [moves <m1> ... <mn>]"""
+        moves_index = args.index('moves') if 'moves' in args else len(args)
+        try:
+            if args and args[0] == 'fen':
+                board = chess.Board(' '.join(args[1:moves_index]))
+            else:
+                board = chess.Board()
+            for uci in args[moves_index + 1:]:
+                board.push_uci(uci)
+        except ValueError as e:
+            # FEN o movimiento no válido: se conserva la posición anterior
+            self.send(f"info string posición no válida: {e}")
+            return
+        self.board = board
+
+    def _go(self, args: List[str]):
+        """go [ponder] [depth d] [movetime ms] [wtime ms] [btime ms] [winc ms] [binc ms] [movestogo n] [infinite]"""
+        params = {}
+        for i, token in enumerate(args[:-1]):
+            if token in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo'):
+                try:
+                    params[token] = int(args[i + 1])
+                except ValueError:
+                    # Se ignora el parámetro y se busca con el resto
+                    self.send(f"info string valor no válido para {token}: {args[i + 1]}")
+
+        def seconds(name):
+            return params[name] / 1000 if name in params else None
+
+        self._stop_event.clear()
+        self._ponderhit_event.clear()
+        if any(name in params for name in ('movetime', 'wtime', 'btime')):
+            time_manager = TimeManager.from_clock(
+                self.board.turn, seconds('wtime'), seconds('btime'),
+                seconds('winc') or 0, seconds('binc') or 0, params.get('movestogo'),
+                seconds('movetime'), stop_event=self._stop_event)
+        else:
+            # Solo profundidad o `infinite`: sin límite de tiempo, hasta `stop`
+            time_manager = TimeManager(stop_event=self._stop_event)
+        # Al ponderar el reloj del rival corre: sin límites hasta ponderhit
+        time_manager.pondering = 'ponder' in args
+        self._time_manager = time_manager
+        self.engine.max_depth = params.get('depth', MAX_SEARCH_DEPTH)
+
+        self._search_thread = threading.Thread(
+            target=self._search, args=(self.board.copy(), time_manager, 'infinite' in args),
+            daemon=True)
+        self._search_thread.start()
+
+    def _search(self, board: chess.Board, time_manager: TimeManager, infinite: bool = False):
+        """Cuerpo del hilo de búsqueda: busca y anuncia bestmove."""
+        try:
+            if self.threads > 1:
+                best_move, _ = self.engine.search_smp(board, self.threads, time_manager=time_manager)
+            else:
+                best_move, _ = self.engine.search(board, time_manager=time_manager)
+        except Exception as e:
+            self.send(f"info string error en la búsqueda: {e}")
+            best_move = None
+        # Con `go infinite` el bestmove solo se envía tras `stop`, y al
+        # ponderar tras `stop` o `ponderhit`
+        while not self._stop_event.is_set() and (
+                infinite or (time_manager.pondering and not self._ponderhit_event.is_set())):
+            self._stop_event.wait(0.01)
+        if best_move is None:
+            # Sin movimiento legal (o fallo): UCI espera igualmente una respuesta
+            self.send("bestmove 0000")
+            return
+        ponder_move = self._ponder_move(board, best_move)
+        if ponder_move is None:
+            self.send(f"bestmove {best_move.uci()}")
+        else:
+            self.send(f"bestmove {best_move.uci()} ponder {ponder_move.uci()}")
+
+    def _ponder_move(self, board: chess.Board, best_move: chess.Move) -> Optional[chess.Move]:
+        """Respuesta esperada del rival: el segundo movimiento de la PV."""
+        pv = self.engine.search_info.pv_line or []
+        if len(pv) < 2 or pv[0] != best_move:
+            return None
+        board.push(best_move)
+        legal = board.is_legal(pv[1])
+        board.pop()
+        return pv[1] if legal else None
+
+    def stop_search(self):
+        """Detiene la búsqueda en curso (si la hay) y espera a su bestmove."""
+        if self._search_thread is not None:
+            self._stop_event.set()
+            self._search_thread.join()
+            self._search_thread = None
+
+    def _send_info(self, info: SearchInfo):
+        """info_callback del motor: una línea info por iteración completa."""
+        # search_info.score es desde las blancas; UCI lo quiere desde el bando al turno
+        score = info.score if self.board.turn == chess.WHITE else -info.score
+        nodes = info.nodes_searched + info.positions_evaluated
+        elapsed_ms = max(1, int(info.time_spent * 1000))
+        pv = ' '.join(move.uci() for move in info.pv_line)
+        self.send(f"info depth {info.depth_reached} {self._format_score(score)} nodes {nodes} "
+                  f"nps {nodes * 1000 // elapsed_ms} time {elapsed_ms} pv {pv}")
+
+    def _format_score(self, score: float) -> str:
+        mate_score = self.engine.MATE_SCORE
+        if abs(score) > mate_score - MAX_SEARCH_DEPTH * 2:
+            # Las puntuaciones de mate son MATE_SCORE - ply
+            plies = mate_score - abs(score)
+            moves = (int(plies) + 1) // 2
+            return f"score mate {moves if score > 0 else -moves}"
+        return f"score cp {int(round(score))}"
+
+
+def main():
+    UCIEngine().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import math
+import struct
 import numpy as np
 import chess
-from typing import Dict, Optional
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence
 
 class ZobristHash:
     def __init__(self, seed: Optional[int] = 42):
@@ -28,33 +31,31 @@ class ZobristHash:
         for square in range(64):
             self.enpassant_keys[square] = rng.randint(0, np.iinfo(np.uint64).max, dtype=np.uint64)
 
-    def compute_hash(self, board: chess.Board) -> np.uint64:
-        """Calcula el hash Zobrist para una posición dada."""
-        hash_value = np.uint64(0)
+        # Copias como enteros de Python: los escalares de NumPy son mucho más
+        # lentos en operaciones XOR sueltas
+        self.piece_keys = self.piece_keys.tolist()
+        self.side_key = int(self.side_key)
+        self.castling_keys = self.castling_keys.tolist()
+        self.enpassant_keys = self.enpassant_keys.tolist()
+
+    def compute_hash(self, board: chess.Board) -> int:
+        """Calcula el hash Zobrist completo para una posición dada."""
+        hash_value = 0
         
-        # Hash de las piezas
-        for square in range(64):
-            piece = board.piece_at(square)
-            if piece is not None:
-                piece_idx = piece.piece_type
-                color_idx = int(piece.color)
-                hash_value ^= self.piece_keys[piece_idx, color_idx, square]
+        # Hash de las piezas (recorriendo solo las casillas ocupadas)
+        for color in chess.COLORS:
+            color_idx = int(color)
+            for piece_type in chess.PIECE_TYPES:
+                keys = self.piece_keys[piece_type][color_idx]
+                for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                    hash_value ^= keys[square]
         
         # Hash del turno
         if board.turn:
             hash_value ^= self.side_key
             
         # Hash de los derechos de enroque
-        castling = 0
-        if board.has_kingside_castling_rights(chess.WHITE):
-            castling |= 1
-        if board.has_queenside_castling_rights(chess.WHITE):
-            castling |= 2
-        if board.has_kingside_castling_rights(chess.BLACK):
-            castling |= 4
-        if board.has_queenside_castling_rights(chess.BLACK):
-            castling |= 8
-        hash_value ^= self.castling_keys[castling]
+        hash_value ^= self.castling_keys[castling_index(board)]
         
         # Hash de en passant
         if board.ep_square is not None:
@@ -62,27 +63,364 @@ class ZobristHash:
             
         return hash_value
 
+    def compute_pawn_hash(self, board: chess.Board) -> int:
+        """Hash Zobrist de la estructura de peones (solo las claves de peón)."""
+        hash_value = 0
+        for color in chess.COLORS:
+            keys = self.piece_keys[chess.PAWN][int(color)]
+            for square in chess.scan_forward(board.pieces_mask(chess.PAWN, color)):
+                hash_value ^= keys[square]
+        return hash_value
+
+
+def castling_index(board: chess.Board) -> int:
+    """Índice de 4 bits (K=1, Q=2, k=4, q=8) de los derechos de enroque."""
+    rights = board.castling_rights
+    index = 0
+    if rights & chess.BB_H1:
+        index |= 1
+    if rights & chess.BB_A1:
+        index |= 2
+    if rights & chess.BB_H8:
+        index |= 4
+    if rights & chess.BB_A8:
+        index |= 8
+    return index
+
+
+class ZobristTracker:
+    """Mantiene el hash Zobrist de un tablero de forma incremental.
+
+    Sustituye a board.push/board.pop durante la búsqueda: la clave se
+    actualiza con las diferencias de cada movimiento (origen, destino,
+    captura, enroque, en passant y promoción) en lugar de recalcularse
+    recorriendo todo el tablero. En paralelo se mantiene la clave de
+    peones, que solo cambia con movimientos y capturas de peón. Con
+    debug=True cada actualización se contrasta con el recálculo completo.
+
+    `listeners` son objetos con push(board, move) y pop() que mantienen su
+    propio estado incremental (p. ej. el acumulador de material del
+    evaluador); push se les llama antes de ejecutar el movimiento.
+
+    `keys` empieza con las posiciones de la partida desde el último
+    movimiento irreversible, de modo que is_repetition detecta también las
+    repeticiones de posiciones anteriores a la búsqueda.
+    """
+    def __init__(self, zobrist: ZobristHash, board: chess.Board, debug: bool = False,
+                 listeners: Sequence = ()):
+        self.zobrist = zobrist
+        self.board = board
+        self.debug = debug
+        self._push_hooks = [listener.push for listener in listeners]
+        self._pop_hooks = [listener.pop for listener in listeners]
+        self.keys: List[int] = self._history_keys(board)
+        self.pawn_keys: List[int] = [zobrist.compute_pawn_hash(board)]
+        # Índices de `keys` tras cada movimiento nulo: las repeticiones no los cruzan
+        self._null_indices: List[int] = []
+
+    def _history_keys(self, board: chess.Board) -> List[int]:
+        """Claves desde el último movimiento irreversible hasta la posición actual."""
+        plies = min(board.halfmove_clock, len(board.move_stack))
+        replay = board.copy(stack=plies)
+        keys = [self.zobrist.compute_hash(replay)]
+        for _ in range(plies):
+            replay.pop()
+            keys.append(self.zobrist.compute_hash(replay))
+        keys.reverse()
+        return keys
+
+    @property
+    def key(self) -> int:
+        """Hash de la posición actual."""
+        return self.keys[-1]
+
+    @property
+    def pawn_key(self) -> int:
+        """Hash de la estructura de peones actual."""
+        return self.pawn_keys[-1]
+
+    def push(self, move: chess.Move):
+        """Ejecuta el movimiento en el tablero y actualiza el hash."""
+        board = self.board
+        zobrist = self.zobrist
+        key = self.keys[-1] ^ zobrist.side_key
+        key ^= zobrist.castling_keys[castling_index(board)]
+        if board.ep_square is not None:
+            key ^= zobrist.enpassant_keys[board.ep_square]
+        pawn_key = self.pawn_keys[-1]
+
+        if move:
+            us = int(board.turn)
+            them = us ^ 1
+            from_square = move.from_square
+            to_square = move.to_square
+            piece_type = board.piece_type_at(from_square)
+            piece_keys = zobrist.piece_keys
+
+            if piece_type == chess.KING and board.is_castling(move):
+                # Enroque: rey y torre cambian de casilla en la misma fila
+                rank = chess.square_rank(from_square)
+                if board.is_kingside_castling(move):
+                    king_to, rook_from, rook_to = chess.square(6, rank), chess.square(7, rank), chess.square(5, rank)
+                else:
+                    king_to, rook_from, rook_to = chess.square(2, rank), chess.square(0, rank), chess.square(3, rank)
+                key ^= piece_keys[chess.KING][us][from_square] ^ piece_keys[chess.KING][us][king_to]
+                key ^= piece_keys[chess.ROOK][us][rook_from] ^ piece_keys[chess.ROOK][us][rook_to]
+            else:
+                key ^= piece_keys[piece_type][us][from_square]
+                key ^= piece_keys[move.promotion or piece_type][us][to_square]
+                if piece_type == chess.PAWN:
+                    pawn_key ^= piece_keys[chess.PAWN][us][from_square]
+                    if not move.promotion:
+                        pawn_key ^= piece_keys[chess.PAWN][us][to_square]
+
+                captured = board.piece_type_at(to_square)
+                if captured:
+                    key ^= piece_keys[captured][them][to_square]
+                    if captured == chess.PAWN:
+                        pawn_key ^= piece_keys[chess.PAWN][them][to_square]
+                elif piece_type == chess.PAWN and to_square == board.ep_square:
+                    # Captura al paso: el peón capturado no está en la casilla destino
+                    captured_square = chess.square(chess.square_file(to_square), chess.square_rank(from_square))
+                    key ^= piece_keys[chess.PAWN][them][captured_square]
+                    pawn_key ^= piece_keys[chess.PAWN][them][captured_square]
+
+        for hook in self._push_hooks:
+            hook(board, move)
+        board.push(move)
+        key ^= zobrist.castling_keys[castling_index(board)]
+        if board.ep_square is not None:
+            key ^= zobrist.enpassant_keys[board.ep_square]
+        self.keys.append(key)
+        self.pawn_keys.append(pawn_key)
+        if not move:
+            self._null_indices.append(len(self.keys) - 1)
+
+        if self.debug:
+            self._verify(move)
+
+    def pop(self) -> chess.Move:
+        """Deshace el último movimiento y restaura el hash anterior."""
+        move = self.board.pop()
+        if self._null_indices and self._null_indices[-1] == len(self.keys) - 1:
+            self._null_indices.pop()
+        self.keys.pop()
+        self.pawn_keys.pop()
+        for hook in self._pop_hooks:
+            hook()
+        if self.debug:
+            self._verify(move)
+        return move
+
+    def is_repetition(self) -> bool:
+        """True si la posición actual ya se dio desde el último movimiento irreversible.
+
+        Basta con una repetición: si se puede repetir una vez, se puede
+        repetir hasta la triple.
+        """
+        keys = self.keys
+        current = len(keys) - 1
+        start = max(current - self.board.halfmove_clock, 0)
+        if self._null_indices:
+            start = max(start, self._null_indices[-1])
+        key = keys[current]
+        # Solo las posiciones con el mismo bando al turno, y la anterior no
+        # puede repetirse con un único movimiento de cada bando
+        for index in range(current - 4, start - 1, -2):
+            if keys[index] == key:
+                return True
+        return False
+
+    def _verify(self, move: chess.Move):
+        """Contrasta la clave incremental con el recálculo completo."""
+        expected = self.zobrist.compute_hash(self.board)
+        if self.keys[-1] != expected:
+            raise RuntimeError(
+                f"Hash Zobrist incremental inconsistente tras {move.uci()} "
+                f"en {self.board.fen()}: {self.keys[-1]:#018x} != {expected:#018x}")
+        expected_pawns = self.zobrist.compute_pawn_hash(self.board)
+        if self.pawn_keys[-1] != expected_pawns:
+            raise RuntimeError(
+                f"Hash de peones incremental inconsistente tras {move.uci()} "
+                f"en {self.board.fen()}: {self.pawn_keys[-1]:#018x} != {expected_pawns:#018x}")
+
 class TranspositionTable:
+    """Tabla de transposición de tamaño fijo sobre un array estructurado de NumPy.
+
+    Cada entrada ocupa 16 bytes: clave (8), score en centipeones enteros
+    (int32, 4), movimiento empaquetado (2), profundidad (1) y un byte con el
+    flag en los 2 bits bajos y la edad de la búsqueda en los 6 altos. Los 8 bytes de datos se
+    escriben como una sola palabra y la clave se guarda como `hash ^ datos`,
+    de modo que una entrada escrita a medias por otro proceso no supera la
+    verificación (esquema sin bloqueos de Hyatt). Las entradas se agrupan
+    en cubetas de `ways` posiciones indexadas por `hash & mask`; al llenarse
+    una cubeta se reemplaza la entrada menos profunda, penalizando las de
+    búsquedas anteriores.
+
+    El score se redondea al centipeón en la dirección que conserva el
+    significado del flag: las cotas inferiores (BETA) hacia abajo y las
+    superiores (ALPHA) hacia arriba, así una entrada nunca produce un corte
+    que el valor real no produciría; los valores EXACT al entero más
+    cercano (error máximo de medio centipeón).
+    """
     EXACT = 0
     ALPHA = 1
     BETA = 2
+
+    ENTRY_DTYPE = np.dtype([
+        ('key', '<u8'),
+        ('score', '<i4'),
+        ('move', '<u2'),
+        ('depth', 'i1'),
+        ('gen_flag', 'u1'),
+    ])
+    # Mismo formato que los campos de datos de ENTRY_DTYPE
+    _DATA = struct.Struct('<iHbB')
+    AGE_CYCLE = 64
     
-    def __init__(self, size_mb: int = 32):
-        # Calcular número de entradas basado en el tamaño en MB
-        # Cada entrada: hash (8 bytes) + value (4 bytes) + flag (1 byte) + depth (1 byte) = 14 bytes
-        self.size = (size_mb * 1024 * 1024) // 14
-        self.table: Dict[np.uint64, tuple[float, int, int, Optional[chess.Move]]] = {}
+    def __init__(self, size_mb: int = 32, ways: int = 4, buffer=None):
+        if ways not in (2, 4):
+            raise ValueError(f"Número de vías no soportado: {ways}")
+        self.ways = ways
+        self.size_mb = size_mb
+        self.size = self.entries_for(size_mb, ways)
+        self.mask = self.size // ways - 1
+        if buffer is None:
+            self.entries = np.zeros(self.size, dtype=self.ENTRY_DTYPE)
+        else:
+            self.entries = np.ndarray(self.size, dtype=self.ENTRY_DTYPE, buffer=buffer)
+        # Vista de cada entrada como dos palabras: clave verificada y datos
+        words = self.entries.view('<u8').reshape(self.size, 2)
+        self._keys = words[:, 0]
+        self._data = words[:, 1]
+        self.age = 0
+
+    @classmethod
+    def entries_for(cls, size_mb: int, ways: int) -> int:
+        """Mayor número de entradas (cubetas potencia de 2) que cabe en size_mb."""
+        max_entries = (size_mb * 1024 * 1024) // cls.ENTRY_DTYPE.itemsize
+        num_buckets = 1 << max(0, (max_entries // ways).bit_length() - 1)
+        return num_buckets * ways
+
+    @property
+    def size_bytes(self) -> int:
+        """Memoria realmente reservada por la tabla."""
+        return self.entries.nbytes
+
+    def new_search(self):
+        """Avanza la edad para que las entradas antiguas sean reemplazables."""
+        self.age = (self.age + 1) % self.AGE_CYCLE
+
+    def clear(self):
+        """Vacía la tabla sin liberar la memoria."""
+        self.entries.fill(0)
+        self.age = 0
+
+    def hashfull(self) -> int:
+        """Ocupación aproximada en tanto por mil (muestra de 1000 entradas)."""
+        sample = min(1000, self.size)
+        used = np.count_nonzero(self._keys[:sample])
+        return used * 1000 // sample
         
-    def store(self, hash_key: np.uint64, value: float, depth: int, 
+    def store(self, hash_key: int, value: float, depth: int, 
              flag: int, best_move: Optional[chess.Move] = None):
         """Almacena una entrada en la tabla de transposición."""
-        if len(self.table) >= self.size:
-            # Si la tabla está llena, eliminar entrada aleatoria
-            # En una implementación más sofisticada, usaríamos un esquema de reemplazo
-            self.table.pop(next(iter(self.table)))
-            
-        self.table[hash_key] = (value, depth, flag, best_move)
+        keys = self._keys
+        data = self._data
+        base = (hash_key & self.mask) * self.ways
+        slot = -1
+        same_key = False
+        worst = None
+        for i in range(base, base + self.ways):
+            stored_key = keys.item(i)
+            stored_data = data.item(i)
+            if stored_key ^ stored_data == hash_key:
+                slot = i
+                same_key = True
+                break
+            if stored_key == 0:
+                slot = i
+                break
+            # Preferir reemplazar entradas poco profundas o de búsquedas viejas
+            relative_age = (self.age - (stored_data >> 58)) % self.AGE_CYCLE
+            priority = ((stored_data >> 48) & 0xFF ^ 0x80) - 0x80 - 8 * relative_age
+            if worst is None or priority < worst:
+                worst = priority
+                slot = i
+
+        if flag == self.BETA:
+            score = math.floor(value)
+        elif flag == self.ALPHA:
+            score = math.ceil(value)
+        else:
+            score = round(value)
+        packed_move = self._pack_move(best_move)
+        if not packed_move and same_key:
+            # Conservar el movimiento previo si la nueva entrada no aporta uno
+            packed_move = (data.item(slot) >> 32) & 0xFFFF
+        word = int.from_bytes(self._DATA.pack(
+            score, packed_move, max(-128, min(127, depth)), (self.age << 2) | flag), 'little')
+        data[slot] = word
+        keys[slot] = hash_key ^ word
         
-    def lookup(self, hash_key: np.uint64) -> Optional[tuple[float, int, int, Optional[chess.Move]]]:
+    def lookup(self, hash_key: int) -> Optional[tuple[int, int, int, Optional[chess.Move]]]:
         """Busca una entrada en la tabla de transposición."""
-        return self.table.get(hash_key)
+        keys = self._keys
+        data = self._data
+        base = (hash_key & self.mask) * self.ways
+        for i in range(base, base + self.ways):
+            word = data.item(i)
+            if keys.item(i) ^ word == hash_key:
+                value, packed_move, depth, gen_flag = self._DATA.unpack(word.to_bytes(8, 'little'))
+                return value, depth, gen_flag & 3, self._unpack_move(packed_move)
+        return None
+
+    @staticmethod
+    def _pack_move(move: Optional[chess.Move]) -> int:
+        """Empaqueta un movimiento en 15 bits: origen, destino y promoción."""
+        if not move:
+            return 0
+        return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+    @staticmethod
+    def _unpack_move(packed: int) -> Optional[chess.Move]:
+        if not packed:
+            return None
+        return chess.Move(packed & 63, (packed >> 6) & 63, (packed >> 12) or None)
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """Tabla de transposición en memoria compartida para búsqueda multiproceso.
+
+    El proceso principal la crea con create() y los procesos auxiliares se
+    conectan por nombre con attach(). No hay bloqueos: la verificación
+    `clave ^ datos` de cada entrada descarta las escrituras concurrentes.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, size_mb: int, ways: int, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        super().__init__(size_mb, ways, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, size_mb: int = 32, ways: int = 4) -> 'SharedTranspositionTable':
+        size = cls.entries_for(size_mb, ways) * cls.ENTRY_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        table = cls(shm, size_mb, ways, owner=True)
+        table.clear()
+        return table
+
+    @classmethod
+    def attach(cls, name: str, size_mb: int, ways: int = 4) -> 'SharedTranspositionTable':
+        return cls(shared_memory.SharedMemory(name=name), size_mb, ways, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """Libera la vista local y, si es el creador, el segmento compartido."""
+        # Las vistas de NumPy deben soltarse antes de cerrar el buffer
+        self.entries = self._keys = self._data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
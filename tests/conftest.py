@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos del motor se importan como en el resto del proyecto (minimax.*, evaluator.*)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(project_root, 'motor', 'search'))
+
+FENS_FILE = os.path.join(project_root, 'FENs.txt')
+
+
+def load_fens(path: str = FENS_FILE):
+    """Posiciones de FENs.txt (separadas por ';' o por líneas)."""
+    with open(path, encoding='utf-8') as f:
+        chunks = f.read().replace('\n', ';').split(';')
+    return [chunk.strip() for chunk in chunks if chunk.strip().count('/') == 7]
+
+
+@pytest.fixture(scope='session')
+def fens():
+    return load_fens()
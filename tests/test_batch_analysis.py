@@ -0,0 +1,25 @@
+from minimax import batch_analysis
+
+# Posición sin mates ni jaques cercanos: la PV de cada iteración mide su profundidad
+QUIET_FEN = 'r1bqk2r/pp2nppp/2n1p3/2ppP3/3P4/2PB1N2/PP3PPP/RNBQ1RK1 b kq - 0 8'
+
+
+class CountdownEvent:
+    """Evento de parada que se activa tras `checks` consultas: fuerza un aborto
+    a mitad de iteración sin depender del reloj."""
+    def __init__(self, checks: int):
+        self.checks = checks
+
+    def is_set(self) -> bool:
+        self.checks -= 1
+        return self.checks < 0
+
+
+def test_aborted_search_reports_completed_depth():
+    batch_analysis._init_worker(8, 4)
+    engine = batch_analysis._worker_engine
+    engine.stop_event = CountdownEvent(20)
+    result = batch_analysis._analyze('1', QUIET_FEN, None)
+    assert engine._aborted
+    assert result['depth'] == engine.search_info.depth_reached - 1
+    assert result['depth'] == len(result['pv'])
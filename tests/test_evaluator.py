@@ -0,0 +1,76 @@
+import random
+
+import chess
+import pytest
+
+from conftest import load_fens
+from evaluator.bitboard import BitboardEvaluator
+from evaluator.accumulator import MaterialAccumulator
+from evaluator.material import MaterialEvaluator
+from minimax.zobrist_hash import ZobristHash, ZobristTracker
+
+PLIES = 40
+
+
+def random_line(fen: str, plies: int = PLIES, seed: int = 1):
+    """La posición y las que siguen con movimientos aleatorios (reproducibles) desde ella."""
+    rng = random.Random(seed)
+    board = chess.Board(fen)
+    for _ in range(plies):
+        yield board
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        board.push(rng.choice(moves))
+
+
+@pytest.fixture(scope='module')
+def reference():
+    return MaterialEvaluator()
+
+
+@pytest.fixture(scope='module')
+def bitboard():
+    return BitboardEvaluator()
+
+
+@pytest.mark.parametrize('fen', load_fens())
+def test_bitboard_matches_material_evaluator(fen, reference, bitboard):
+    for board in random_line(fen):
+        assert bitboard.evaluate(board) == pytest.approx(reference.evaluate(board), abs=1e-6), board.fen()
+
+
+def assert_matches_full(evaluator, board):
+    """El acumulador activo coincide con el recálculo completo de la posición."""
+    full = MaterialAccumulator(evaluator)
+    full.reset(board)
+    assert evaluator.accumulator.stack[-1] == full.stack[-1], board.fen()
+    material, phase = evaluator._material_and_phase(board)
+    expected_phase = evaluator._get_game_phase(board)
+    assert phase == pytest.approx(expected_phase, abs=1e-12), board.fen()
+    assert material == pytest.approx(
+        evaluator._evaluate_material_and_position(board, expected_phase), abs=1e-6), board.fen()
+
+
+@pytest.mark.parametrize('evaluator_class', [MaterialEvaluator, BitboardEvaluator])
+def test_accumulator_matches_full_recompute(evaluator_class, fens):
+    evaluator = evaluator_class()
+    zobrist = ZobristHash()
+    rng = random.Random(1)
+    for fen in fens:
+        board = chess.Board(fen)
+        evaluator.begin_search(board)
+        tracker = ZobristTracker(zobrist, board, listeners=[evaluator])
+        try:
+            for _ in range(PLIES):
+                assert_matches_full(evaluator, board)
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                tracker.push(rng.choice(moves))
+            # Al deshacer, cada posición anterior debe recuperar sus sumas
+            while board.move_stack:
+                tracker.pop()
+                assert_matches_full(evaluator, board)
+        finally:
+            evaluator.end_search()
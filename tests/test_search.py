@@ -0,0 +1,88 @@
+import chess
+import pytest
+
+from evaluator.bitboard import BitboardEvaluator
+from evaluator.material import MaterialEvaluator
+from minimax import minimaxengine
+from minimax.minimaxengine import MinimaxEngine
+
+# Sin técnicas que dependen de la ventana, PVS debe dar exactamente lo mismo
+# que la ventana completa
+EXACT_OPTIONS = dict(use_aspiration=False, use_check_extensions=False, use_futility=False,
+                     use_reverse_futility=False, use_lmp=False, use_lmr_table=False)
+
+PVS_DEPTH = 4
+PVS_POSITIONS = 16
+# Nodos (incluida la quiescencia) medidos al añadir el test, con ~5% de margen
+PVS_NODE_CEILING = 61000
+DEFAULT_NODE_CEILING = 33000
+
+
+def search_all(fens, **options):
+    """Busca cada posición con un motor nuevo; devuelve resultados y nodos totales."""
+    results = []
+    nodes = 0
+    for fen in fens:
+        engine = MinimaxEngine(BitboardEvaluator(), depth=PVS_DEPTH, **options)
+        move, value = engine.search(chess.Board(fen))
+        results.append((move, round(value, 2)))
+        nodes += engine.search_info.nodes_searched + engine.search_info.positions_evaluated
+    return results, nodes
+
+
+def test_pvs_matches_full_window(fens):
+    fens = fens[:PVS_POSITIONS]
+    full, full_nodes = search_all(fens, use_pvs=False, **EXACT_OPTIONS)
+    pvs, pvs_nodes = search_all(fens, use_pvs=True, **EXACT_OPTIONS)
+    assert pvs == full
+    assert pvs_nodes <= full_nodes
+    assert pvs_nodes <= PVS_NODE_CEILING
+
+
+def test_default_search_node_ceiling(fens):
+    _, nodes = search_all(fens[:PVS_POSITIONS])
+    assert nodes <= DEFAULT_NODE_CEILING
+
+
+def test_mate_distance_survives_tt_between_searches():
+    engine = MinimaxEngine(MaterialEvaluator(), depth=5)
+    board = chess.Board('1k5r/pP3ppp/3p2b1/1BN1n3/1Q2P3/P1B5/KP3P1P/7q w - - 1 0')
+    move, value = engine.search(board)
+    assert move == chess.Move.from_uci('c5a6')
+    assert value == engine.MATE_SCORE - 5
+
+    board.push_uci('c5a6')
+    board.push_uci('b8b7')
+    for depth in (1, 2, 3):
+        engine.max_depth = depth
+        _, value = engine.search(board)
+        # Con la TT de la búsqueda anterior, el mate está ahora a 3 plies
+        assert value == pytest.approx(engine.MATE_SCORE - 3)
+
+
+
+def _split_worker_options():
+    return minimaxengine._split_engine.search_options()
+
+
+def _smp_worker_options():
+    return minimaxengine._smp_engine.search_options()
+
+
+def test_worker_engines_use_engine_options():
+    # Los motores de los pools deben buscar con el mismo algoritmo que el principal
+    engine = MinimaxEngine(MaterialEvaluator(), depth=2, **EXACT_OPTIONS)
+    engine.mp_start_method = 'fork'
+    try:
+        engine._ensure_split_pool(1)
+        assert engine._split_pool.submit(_split_worker_options).result() == engine.search_options()
+        engine._ensure_smp_pool(2)
+        assert engine._smp_pool.submit(_smp_worker_options).result() == engine.search_options()
+        # Cambiar una opción recrea los pools
+        engine.use_lmp = True
+        engine._ensure_split_pool(1)
+        assert engine._split_pool.submit(_split_worker_options).result()['use_lmp']
+        engine._ensure_smp_pool(2)
+        assert engine._smp_pool.submit(_smp_worker_options).result()['use_lmp']
+    finally:
+        engine.close()
@@ -0,0 +1,43 @@
+import chess
+import pytest
+
+from minimax.move_ordering import MovePicker, BAD_CAPTURES, see, losing_capture
+
+SEE_CASES = [
+    # Peón indefenso
+    ('1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1', 'e1e5', 100),
+    # Caballo por peón defendido, con rayos X detrás
+    ('1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1', 'd3e5', -225),
+    # Captura al paso
+    ('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1', 'e5d6', 100),
+    # Dama por peón defendido por la dama rival
+    ('3qk3/8/8/3p4/4Q3/8/8/4K3 w - - 0 1', 'e4d5', -875),
+    # Torres dobladas en la columna: gana quien tiene el último atacante
+    ('3rk3/3r4/8/3p4/8/3R4/3R4/3QK3 w - - 0 1', 'd3d5', 100),
+    # Promoción en casilla atacada: se pierde la dama recién coronada
+    ('2r1k3/1P6/8/8/8/8/8/4K3 w - - 0 1', 'b7b8q', -100),
+    # El rey no puede recapturar en una casilla defendida...
+    ('8/8/4k3/3r4/8/3R4/8/3RK3 w - - 0 1', 'd3d5', 500),
+    # ...pero sí en una indefensa
+    ('8/8/4k3/3r4/8/3R4/8/4K3 w - - 0 1', 'd3d5', 0),
+]
+
+
+@pytest.mark.parametrize('fen, uci, expected', SEE_CASES)
+def test_see_values(fen, uci, expected):
+    assert see(chess.Board(fen), chess.Move.from_uci(uci)) == expected
+
+
+@pytest.mark.parametrize('fen, uci, expected', SEE_CASES)
+def test_losing_capture_agrees_with_see(fen, uci, expected):
+    assert losing_capture(chess.Board(fen), chess.Move.from_uci(uci)) == (expected < 0)
+
+
+def test_picker_defers_losing_captures():
+    board = chess.Board('1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1')
+    picker = MovePicker(board)
+    stages = {}
+    for move in picker:
+        stages[move] = picker.stage
+    assert stages[chess.Move.from_uci('d3e5')] == BAD_CAPTURES
+    assert sorted(stages, key=lambda move: move.uci()) == sorted(board.legal_moves, key=lambda move: move.uci())
@@ -0,0 +1,92 @@
+import random
+
+import chess
+import pytest
+
+from minimax.zobrist_hash import TranspositionTable, SharedTranspositionTable
+
+
+def test_store_and_lookup_roundtrip():
+    tt = TranspositionTable(1)
+    move = chess.Move.from_uci('e7e8q')
+    tt.store(0x1234_5678_9ABC_DEF0, 35, 6, TranspositionTable.BETA, move)
+    assert tt.lookup(0x1234_5678_9ABC_DEF0) == (35, 6, TranspositionTable.BETA, move)
+    # Misma cubeta, otra clave: no hay acierto
+    assert tt.lookup(0x1234_5678_9ABC_DEF0 ^ (1 << 63)) is None
+
+
+@pytest.mark.parametrize('flag, value, expected', [
+    (TranspositionTable.EXACT, 402.32, 402),
+    (TranspositionTable.EXACT, -402.68, -403),
+    (TranspositionTable.BETA, 402.68, 402),
+    (TranspositionTable.BETA, -402.32, -403),
+    (TranspositionTable.ALPHA, 402.32, 403),
+    (TranspositionTable.ALPHA, -402.68, -402),
+])
+def test_score_rounding_keeps_bounds_valid(flag, value, expected):
+    # Cota inferior hacia abajo, superior hacia arriba, exacto al más cercano
+    tt = TranspositionTable(1)
+    tt.store(77, value, 5, flag)
+    assert tt.lookup(77)[0] == expected
+
+
+def test_store_keeps_previous_move_without_new_one():
+    tt = TranspositionTable(1)
+    move = chess.Move.from_uci('g1f3')
+    tt.store(42, 10, 3, TranspositionTable.EXACT, move)
+    tt.store(42, -5, 4, TranspositionTable.ALPHA)
+    assert tt.lookup(42) == (-5, 4, TranspositionTable.ALPHA, move)
+
+
+def test_bucket_replaces_shallowest_entry():
+    tt = TranspositionTable(1, ways=4)
+    bucket_stride = tt.mask + 1
+    keys = [7 + i * bucket_stride for i in range(5)]
+    for depth, key in zip((5, 1, 8, 3), keys):
+        tt.store(key, 0, depth, TranspositionTable.EXACT)
+    # La cubeta está llena: la quinta clave sustituye a la de profundidad 1
+    tt.store(keys[4], 0, 2, TranspositionTable.EXACT)
+    assert tt.lookup(keys[1]) is None
+    assert all(tt.lookup(key) is not None for key in keys[:1] + keys[2:])
+
+
+def test_old_search_entries_are_replaced_first():
+    tt = TranspositionTable(1, ways=2)
+    bucket_stride = tt.mask + 1
+    old_deep, recent = 9, 9 + bucket_stride
+    tt.store(old_deep, 0, 6, TranspositionTable.EXACT)
+    for _ in range(2):
+        tt.new_search()
+    tt.store(recent, 0, 2, TranspositionTable.EXACT)
+    tt.store(9 + 2 * bucket_stride, 0, 2, TranspositionTable.EXACT)
+    assert tt.lookup(old_deep) is None
+    assert tt.lookup(recent) is not None
+
+
+def test_clear_and_many_keys():
+    tt = TranspositionTable(1)
+    rng = random.Random(3)
+    keys = [rng.getrandbits(64) | 1 for _ in range(500)]
+    for key in keys:
+        tt.store(key, key % 1000, 1, TranspositionTable.EXACT)
+    hits = [tt.lookup(key) for key in keys]
+    assert all(hit is None or hit[0] == key % 1000 for hit, key in zip(hits, keys))
+    assert sum(hit is not None for hit in hits) > 450
+    tt.clear()
+    assert all(tt.lookup(key) is None for key in keys)
+
+
+def test_shared_table_is_visible_from_attached_view():
+    owner = SharedTranspositionTable.create(1)
+    try:
+        view = SharedTranspositionTable.attach(owner.name, 1)
+        owner.store(99, 12, 4, TranspositionTable.EXACT, chess.Move.from_uci('e2e4'))
+        assert view.lookup(99) == (12, 4, TranspositionTable.EXACT, chess.Move.from_uci('e2e4'))
+        view.close()
+    finally:
+        owner.close()
+
+
+def test_unsupported_ways():
+    with pytest.raises(ValueError):
+        TranspositionTable(1, ways=3)
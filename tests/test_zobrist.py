@@ -0,0 +1,61 @@
+import random
+
+import chess
+
+from evaluator.material import MaterialEvaluator
+from minimax.minimaxengine import MinimaxEngine
+from minimax.zobrist_hash import ZobristHash, ZobristTracker
+
+# Posiciones con enroque, captura al paso y promociones a la vista
+SPECIAL_FENS = [
+    'r3k2r/pppq1ppp/2n2n2/3pp3/3PP3/2N2N2/PPPQ1PPP/R3K2R w KQkq - 0 1',
+    'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+    '8/1P4k1/8/8/8/8/5p2/4K1N1 w - - 0 1',
+]
+
+
+def test_incremental_hash_matches_full_recompute(fens):
+    zobrist = ZobristHash()
+    rng = random.Random(7)
+    for fen in fens + SPECIAL_FENS:
+        board = chess.Board(fen)
+        tracker = ZobristTracker(zobrist, board)
+        keys = [tracker.key]
+        for _ in range(40):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            tracker.push(rng.choice(moves))
+            assert tracker.key == zobrist.compute_hash(board)
+            assert tracker.pawn_key == zobrist.compute_pawn_hash(board)
+            keys.append(tracker.key)
+        # Al deshacer se recuperan exactamente las claves anteriores
+        while len(keys) > 1:
+            keys.pop()
+            tracker.pop()
+            assert tracker.key == keys[-1]
+
+
+def test_debug_hash_search_runs_clean(fens):
+    # debug_hash contrasta cada push/pop con el recálculo y lanza RuntimeError si difieren
+    for fen in fens[:4] + SPECIAL_FENS:
+        engine = MinimaxEngine(MaterialEvaluator(), depth=3, debug_hash=True)
+        board = chess.Board(fen)
+        move, _ = engine.search(board)
+        assert move in board.legal_moves
+        assert board.fen() == chess.Board(fen).fen()
+
+
+def test_null_move_and_repetition():
+    zobrist = ZobristHash()
+    board = chess.Board()
+    for uci in ['g1f3', 'g8f6', 'f3g1', 'f6g8']:
+        board.push_uci(uci)
+    tracker = ZobristTracker(zobrist, board)
+    # La historia de la partida forma parte de las claves
+    assert tracker.is_repetition()
+    tracker.push(chess.Move.null())
+    assert tracker.key == zobrist.compute_hash(board)
+    tracker.push(chess.Move.null())
+    # Las repeticiones no cruzan un movimiento nulo
+    assert not tracker.is_repetition()